@@ -3,10 +3,11 @@
 
 """
 统一的百度网盘下载器
-基于BaiduPCS-Py命令行工具，支持baidu_pan://协议
+基于BaiduPCS-Py Python API（进程内调用），支持baidu_pan://协议
 通过全局下载管理器确保串行下载
 """
 
+import logging
 import os
 import re
 from typing import Optional, List, Dict, Union, Tuple
@@ -15,7 +16,12 @@ from urllib.parse import unquote
 
 from app.downloaders.base import Downloader, DownloadQuality, QUALITY_MAP
 from app.models.notes_model import AudioDownloadResult
-from app.third_party.baidupcs_api import BaiduPCSDownloader as BaiduPCSApiDownloader
+from app.third_party.baidupcs_api import (
+    get_shared_downloader,
+    VIDEO_EXTENSIONS,
+    AUDIO_EXTENSIONS,
+    MEDIA_EXTENSIONS,
+)
 from app.services.global_download_manager import global_download_manager
 from app.exceptions.auth_exceptions import AuthRequiredException
 from app.utils.logger import get_logger
@@ -35,11 +41,12 @@ class BaiduPCSDownloader(Downloader):
     def __init__(self):
         super().__init__()
         # 使用 API 下载器（直接调用 Python API，不再使用命令行工具）
-        self.api_downloader = BaiduPCSApiDownloader()
+        # 进程内共享同一个实例，避免每次创建下载器都重新加载账号并新建 HTTP 会话
+        self.api_downloader = get_shared_downloader()
         
         # 支持的视频和音频格式
-        self.video_extensions = {'.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.3gp', '.ts', '.m2ts', '.f4v', '.rmvb', '.rm'}
-        self.audio_extensions = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a', '.ape', '.ac3', '.dts'}
+        self.video_extensions = VIDEO_EXTENSIONS
+        self.audio_extensions = AUDIO_EXTENSIONS
         
         logger.info("🔧 统一百度网盘下载器初始化完成（使用全局下载管理器）")
     
@@ -87,6 +94,21 @@ class BaiduPCSDownloader(Downloader):
             return result.get("files", [])
         return []
     
+    def filter_media_files(self, files: List[Dict[str, any]]) -> List[Dict[str, any]]:
+        """
+        过滤出媒体文件（视频/音频）
+        
+        list_files 已经标记了 is_media，直接复用；缺少该标记的条目再按扩展名判断
+        """
+        media_extensions = MEDIA_EXTENSIONS
+        return [
+            f for f in files
+            if not f.get("is_dir", False) and (
+                f.get("is_media")
+                or os.path.splitext(f.get("filename") or f.get("server_filename", ""))[1].lower() in media_extensions
+            )
+        ]
+    
     def get_current_user_info(self) -> Dict[str, any]:
         """获取当前用户信息"""
         if not self.is_authenticated():
@@ -132,15 +154,17 @@ class BaiduPCSDownloader(Downloader):
                     filename = urllib.parse.unquote(filename)
                     # ⚠️ 关键修复：清理文件名中的换行符和多余空格
                     filename = filename.replace('\n', '').replace('\r', '').replace('\t', '')
-                    logger.debug(f"🔍 解析后的filename: {repr(filename)}")
+                    logger.debug("🔍 解析后的filename: %r", filename)
                 if file_path:
                     original_path = file_path
                     file_path = urllib.parse.unquote(file_path)
                     # ⚠️ 关键修复：清理路径中的换行符和多余空格
                     file_path = file_path.replace('\n', '').replace('\r', '').replace('\t', '')
-                    logger.info(f"🔍 URL解析 - 原始path参数: {repr(original_path)}")
-                    logger.info(f"🔍 URL解析 - unquote后: {repr(urllib.parse.unquote(original_path))}")
-                    logger.info(f"🔍 URL解析 - 清理后的file_path: {repr(file_path)}")
+                    logger.info("🔍 URL解析 - 原始path参数: %r", original_path)
+                    # unquote 仅用于调试输出，未开启 DEBUG 时不重复解码
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("🔍 URL解析 - unquote后: %r", urllib.parse.unquote(original_path))
+                    logger.info("🔍 URL解析 - 清理后的file_path: %r", file_path)
                 
                 return fs_id, filename, file_path
             else:
@@ -1,4 +1,5 @@
 import os
+import shutil
 import subprocess
 from abc import ABC
 from typing import Union, Optional
@@ -62,13 +63,13 @@ class KuaiShouDownloader(Downloader, ABC):
             )
 
         # 下载 mp4 视频
-        resp = requests.get(photo_info['photoUrl'], stream=True)
-        if resp.status_code == 200:
+        with requests.get(photo_info['photoUrl'], stream=True) as resp:
+            if resp.status_code != 200:
+                raise Exception(f"视频下载失败: {resp.status_code}")
+            # 直接从原始流按 1MB 块拷贝到文件，省去 iter_content 的逐块生成器开销
+            resp.raw.decode_content = True
             with open(mp4_path, "wb") as f:
-                for chunk in resp.iter_content(1024 * 1024):
-                    f.write(chunk)
-        else:
-            raise Exception(f"视频下载失败: {resp.status_code}")
+                shutil.copyfileobj(resp.raw, f, 1024 * 1024)
 
         # 使用 ffmpeg 转换为 mp3
         try:
@@ -48,13 +48,15 @@ class LocalDownloader(Downloader, ABC):
                 '-y',  # 覆盖
                 output_path
             ]
-            subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, encoding='utf-8', errors='ignore')
+            # 输出按字节捕获，只在失败时解码，成功路径不再把 ffmpeg 的日志整体转成文本
+            subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
 
             if not os.path.exists(output_path):
                 raise RuntimeError(f"封面图片生成失败: {output_path}")
 
             return output_path
         except subprocess.CalledProcessError as e:
+            logger.error(f"ffmpeg 提取封面失败: {(e.stderr or b'').decode('utf-8', errors='replace').strip()[-500:]}")
             raise RuntimeError(f"提取封面失败: {output_path}") from e
 
     def convert_to_mp3(self, input_path: str, output_dir: Optional[str] = None) -> str:
@@ -91,7 +93,7 @@ class LocalDownloader(Downloader, ABC):
                 output_path
             ]
 
-            subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, encoding='utf-8', errors='ignore')
+            subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
 
             if not os.path.exists(output_path):
                 raise RuntimeError(f"MP3转换失败: {output_path}")
@@ -100,6 +102,7 @@ class LocalDownloader(Downloader, ABC):
             return output_path
 
         except subprocess.CalledProcessError as e:
+            logger.error(f"ffmpeg 转换失败: {(e.stderr or b'').decode('utf-8', errors='replace').strip()[-500:]}")
             raise RuntimeError(f"ffmpeg 转换失败: {e}")
 
 
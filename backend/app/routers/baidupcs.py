@@ -3,7 +3,7 @@
 
 """
 统一的百度网盘API路由
-基于BaiduPCS-Py命令行工具，提供完整的百度网盘操作接口
+基于BaiduPCS-Py Python API（进程内调用），提供完整的百度网盘操作接口
 """
 
 from fastapi import APIRouter, HTTPException, Query, Body
@@ -13,14 +13,14 @@ from pydantic import BaseModel
 from app.utils.response import ResponseWrapper as R
 from app.utils.logger import get_logger
 from app.downloaders.baidupcs_downloader import BaiduPCSDownloader, BaiduPanDownloader
-from app.third_party.baidupcs_api import BaiduPCSDownloader as BaiduPCSApiDownloader
+from app.third_party.baidupcs_api import get_shared_downloader
 from app.exceptions.auth_exceptions import AuthRequiredException
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/baidupcs", tags=["百度网盘"])
 
-# 使用 API 下载器替代命令行工具
-api_downloader = BaiduPCSApiDownloader()
+# 使用 API 下载器替代命令行工具（与 BaiduPCSDownloader 共享同一实例）
+api_downloader = get_shared_downloader()
 
 
 # =============== 请求模型 ===============
@@ -635,7 +635,7 @@ def get_usage_guide():
     """获取使用指南"""
     return R.success({
         "title": "统一百度网盘API使用指南",
-        "description": "基于BaiduPCS-Py命令行工具的完整百度网盘操作接口",
+        "description": "基于BaiduPCS-Py Python API的完整百度网盘操作接口",
         "setup_steps": [
             {
                 "step": 1,
@@ -690,7 +690,7 @@ def get_usage_guide():
             ]
         },
         "advantages": [
-            "基于BaiduPCS-Py命令行工具，稳定可靠",
+            "进程内直接调用BaiduPCS-Py Python API，无需启动命令行子进程",
             "支持baidu_pan://协议链接",
             "完整的用户认证管理",
             "支持批量文件操作",
@@ -1,13 +1,25 @@
 # app/routers/note.py
+import asyncio
+import functools
 import json
+import logging
 import os
+import re
+import shutil
+import sys
+import threading
 import traceback
 import uuid
 import time
 import glob
+import mmap
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType, SimpleNamespace
 from typing import Optional, Union, List, Tuple
 from urllib.parse import urlparse
 
+import orjson
+
 from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File
 from pydantic import BaseModel, validator, field_validator
 from dataclasses import asdict
@@ -19,7 +31,7 @@ from app.utils.response import ResponseWrapper as R
 from app.utils.url_parser import extract_video_id, is_collection_url, extract_collection_videos, identify_platform
 from app.validators.video_url_validator import is_supported_video_url
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, ORJSONResponse
 import httpx
 from app.enmus.task_status_enums import TaskStatus
 from app.models.note_api import StandardResponse, SingleVideoResponse, CollectionResponse, TaskInfo
@@ -73,6 +85,211 @@ class VideoRequest(BaseModel):
 NOTE_OUTPUT_DIR = "note_results"
 UPLOAD_DIR = "uploads"
 
+# 默认值字符串显式驻留（非标识符形式的字面量不会被编译器自动驻留），
+# 所有重建出来的 task_data 共享同一个对象；键名本身是标识符字面量，已自动驻留
+_DEFAULT_MODEL_NAME = sys.intern('gpt-4o-mini')
+_DEFAULT_PROVIDER_ID = sys.intern('openai')
+_DEFAULT_STYLE = sys.intern('简洁')
+
+# 重建/重置任务时使用的默认任务配置模板（只读，构建时复制一份）
+_DEFAULT_TASK_DATA = MappingProxyType({
+    'quality': DownloadQuality.fast,
+    'model_name': _DEFAULT_MODEL_NAME,
+    'provider_id': _DEFAULT_PROVIDER_ID,
+    'screenshot': False,
+    'link': False,
+    'format': [],
+    'style': _DEFAULT_STYLE,
+    'extras': None,
+    'video_understanding': False,
+    'video_interval': 0,
+    'grid_size': [],
+})
+
+# 列表类型的配置项，构建任务时逐个复制，避免共享默认值或 base 中的同一个列表
+_LIST_TASK_KEYS = ('format', 'grid_size')
+
+
+def _build_task_data(video_url: str, platform: str, title: str, base=None, **overrides) -> dict:
+    """基于默认模板构建任务数据，优先级: overrides > base 中已有的配置项 > 默认值"""
+    task_data = dict(_DEFAULT_TASK_DATA)
+    if base:
+        task_data.update((key, base[key]) for key in _DEFAULT_TASK_DATA if key in base)
+    if overrides:
+        task_data.update(overrides)
+    for key in _LIST_TASK_KEYS:
+        value = task_data[key]
+        if isinstance(value, (list, tuple)):
+            task_data[key] = list(value)
+    task_data['video_url'] = video_url
+    task_data['platform'] = platform
+    task_data['title'] = title
+    return task_data
+
+
+# 预先规范化输出目录前缀，按任务拼接路径时直接字符串相加，避免反复调用 os.path.join
+_NOTE_OUTPUT_PREFIX = NOTE_OUTPUT_DIR.rstrip("/\\") + os.sep
+
+
+def _task_paths(task_id: str) -> SimpleNamespace:
+    """一次性计算任务相关文件路径"""
+    prefix = _NOTE_OUTPUT_PREFIX + task_id
+    return SimpleNamespace(
+        prefix=prefix,
+        result=prefix + ".json",
+        status=prefix + ".status.json",
+        request=prefix + ".request.json",
+        audio_meta=prefix + "_audio.json",
+    )
+
+
+def _dump_request_file(path: str, data: dict):
+    """以紧凑的二进制形式写入原始请求数据文件（不缩进，减少编码和写盘开销）"""
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(data))
+
+
+def _load_json_file(path: str):
+    """以二进制读取并用 orjson 解析 JSON 文件，遇到 orjson 不接受的内容（如 NaN）时回退到标准库"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return json.loads(raw)
+
+
+def _load_request_file(path: str, size: int) -> dict:
+    """通过 mmap 只读映射原始请求数据文件并直接交给 orjson 解析，省去读入中间缓冲区"""
+    if size == 0:
+        # 空文件无法 mmap
+        return {}
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            try:
+                return orjson.loads(view)
+            except orjson.JSONDecodeError:
+                return json.loads(bytes(view))
+
+
+# 重建/重置任务时真正用到的结果文件顶层字段，其余（transcript、markdown 等大字段）解析后立即丢弃
+_RESULT_META_KEYS = ("error", "url", "video_url", "request_data", "audioMeta")
+_RESULT_META_NEEDLES = tuple(f'"{key}"'.encode() for key in _RESULT_META_KEYS)
+
+
+def _peek_result_meta(path: str) -> Tuple[dict, bool]:
+    """读取结果文件，只保留重建任务所需的元数据字段，并返回是否包含 transcript
+
+    先在 mmap 映射上做字节级查找：文件中根本不出现任何元数据键名时，解析结果必然为空，
+    直接跳过整份文件（通常是体积最大的完整转写结果）的 JSON 解析。
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}, False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if not any(mm.find(needle) != -1 for needle in _RESULT_META_NEEDLES):
+                return {}, False
+            with memoryview(mm) as view:
+                try:
+                    result_data = orjson.loads(view)
+                except orjson.JSONDecodeError:
+                    result_data = json.loads(bytes(view))
+    if not isinstance(result_data, dict):
+        return {}, False
+    meta = {key: result_data[key] for key in _RESULT_META_KEYS if key in result_data}
+    return meta, "transcript" in result_data
+
+
+@functools.lru_cache(maxsize=4096)
+def _load_request_file_by_version(path: str, mtime_ns: int, size: int) -> MappingProxyType:
+    """按 (路径, mtime, 大小) 缓存解析结果，文件被重写后自动失效"""
+    data = _load_request_file(path, size)
+    original_request = data.get("original_request")
+    if isinstance(original_request, dict):
+        data["original_request"] = MappingProxyType(original_request)
+    return MappingProxyType(data)
+
+
+def _load_request_file_cached(path: str) -> MappingProxyType:
+    """读取原始请求数据文件（带缓存），返回只读视图，调用方不得修改"""
+    st = os.stat(path)
+    return _load_request_file_by_version(path, st.st_mtime_ns, st.st_size)
+
+
+# 重置任务时用于识别平台和解析BV号的预编译正则
+_PLATFORM_RE = re.compile(r'(?P<bilibili>bilibili\.com|b23\.tv)|(?P<youtube>youtube\.com|youtu\.be)')
+_BV_RE = re.compile(r'^(BV[0-9A-Za-z]+)(?:_p(\d+))?$')
+
+
+def _detect_platform_from_url(url: str) -> str:
+    """根据URL识别平台，一次正则扫描代替多次子串查找"""
+    m = _PLATFORM_RE.search(url)
+    return m.lastgroup if m else "unknown"
+
+
+def _bilibili_url_from_video_id(video_id: str) -> Optional[str]:
+    """将BV号（可带 _p 分P后缀，例如 BV1pwj2zxEL9_p64）还原为B站视频URL"""
+    m = _BV_RE.match(video_id)
+    if m:
+        base_bv, p_num = m.group(1), m.group(2)
+        if p_num:
+            return f"https://www.bilibili.com/video/{base_bv}?p={int(p_num)}"
+        return f"https://www.bilibili.com/video/{base_bv}"
+    
+    # 非标准格式按原有逻辑处理：以 BV 开头时按第一个 _p 拆分，分P编号无效则只用基础BV号
+    if not video_id.startswith("BV"):
+        return None
+    if "_p" in video_id:
+        base_bv, p_part = video_id.split("_p", 1)
+        try:
+            return f"https://www.bilibili.com/video/{base_bv}?p={int(p_part)}"
+        except ValueError:
+            return f"https://www.bilibili.com/video/{base_bv}"
+    return f"https://www.bilibili.com/video/{video_id}"
+
+
+def _remove_file(file_path: str) -> Tuple[str, bool]:
+    """删除单个文件，返回 (文件名, 是否删除)；文件不存在时直接视为未删除"""
+    filename = os.path.basename(file_path)
+    try:
+        # 直接 unlink，省掉 exists 检查的一次 stat，也避免检查与删除之间的竞态
+        os.unlink(file_path)
+        return filename, True
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"⚠️ 删除文件失败 {filename}: {e}")
+    return filename, False
+
+
+def _remove_files_batch(file_paths: List[str]) -> List[str]:
+    """批量删除文件，返回成功删除的文件名列表"""
+    cleaned_files = []
+    for file_path in file_paths:
+        filename, ok = _remove_file(file_path)
+        if ok:
+            cleaned_files.append(filename)
+            logger.info("🗑️ 已删除文件: %s", filename)
+    return cleaned_files
+
+
+# 强制重新开始时需要清理的任务文件：{task_id}.json / .status.json / .request.json 以及 {task_id}_*.json/md/txt
+_RESTART_CLEANUP_PATTERN = r"{}(?:\.(?:request\.|status\.)?json|_.*\.(?:json|md|txt))"
+
+
+def _scan_task_files(task_id: str) -> List[str]:
+    """单次遍历输出目录，用一条预编译正则找出属于该任务的所有待清理文件"""
+    match_name = re.compile(_RESTART_CLEANUP_PATTERN.format(re.escape(task_id))).fullmatch
+    matches = []
+    try:
+        with os.scandir(NOTE_OUTPUT_DIR) as entries:
+            for entry in entries:
+                if match_name(entry.name):
+                    matches.append(entry.path)
+    except FileNotFoundError:
+        pass
+    return matches
+
 
 def save_original_request_data(task_id: str, request_data: dict):
     """保存原始请求数据到持久化存储"""
@@ -88,11 +305,10 @@ def save_original_request_data(task_id: str, request_data: dict):
         }
         
         # 保存到 {task_id}.request.json 文件
-        request_file_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.request.json")
-        with open(request_file_path, "w", encoding="utf-8") as f:
-            json.dump(request_data_with_meta, f, ensure_ascii=False, indent=2)
+        request_file_path = _task_paths(task_id).request
+        _dump_request_file(request_file_path, request_data_with_meta)
             
-        logger.info(f"✅ 原始请求数据已保存: {task_id}")
+        logger.info("✅ 原始请求数据已保存: %s", task_id)
         
     except Exception as e:
         logger.error(f"❌ 保存原始请求数据失败: {task_id}, {e}")
@@ -101,19 +317,18 @@ def save_original_request_data(task_id: str, request_data: dict):
 def load_original_request_data(task_id: str) -> dict:
     """从持久化存储加载原始请求数据"""
     try:
-        request_file_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.request.json")
+        request_file_path = _task_paths(task_id).request
         
-        if os.path.exists(request_file_path):
-            with open(request_file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            # 返回原始请求数据
-            original_request = data.get("original_request", {})
-            logger.info(f"✅ 成功加载原始请求数据: {task_id}")
-            return original_request
-        else:
+        try:
+            data = _load_request_file_cached(request_file_path)
+        except FileNotFoundError:
             logger.warning(f"⚠️ 原始请求数据文件不存在: {task_id}")
             return {}
+        
+        # 缓存内容为只读视图，对外返回普通 dict 副本
+        original_request = dict(data.get("original_request") or {})
+        logger.info("✅ 成功加载原始请求数据: %s", task_id)
+        return original_request
             
     except Exception as e:
         logger.error(f"❌ 加载原始请求数据失败: {task_id}, {e}")
@@ -135,7 +350,7 @@ def save_note_to_file(task_id: str, note):
             # 其他情况，转换为字典格式
             note_data = {"data": str(note), "type": type(note).__name__}
         
-        with open(os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.json"), "w", encoding="utf-8") as f:
+        with open(_task_paths(task_id).result, "w", encoding="utf-8") as f:
             json.dump(note_data, f, ensure_ascii=False, indent=2)
             
     except Exception as e:
@@ -145,7 +360,7 @@ def save_note_to_file(task_id: str, note):
             "note_type": type(note).__name__,
             "task_id": task_id
         }
-        with open(os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.json"), "w", encoding="utf-8") as f:
+        with open(_task_paths(task_id).result, "w", encoding="utf-8") as f:
             json.dump(error_data, f, ensure_ascii=False, indent=2)
 
 
@@ -190,13 +405,19 @@ def delete_task(data: RecordRequest):
         return R.error(msg=e)
 
 
+def _save_upload_file(file: UploadFile, file_location: str):
+    """将上传文件分块拷贝到磁盘（阻塞操作，在线程中执行）"""
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    with open(file_location, "wb") as f:
+        shutil.copyfileobj(file.file, f)
+
+
 @router.post("/upload")
 async def upload(file: UploadFile = File(...)):
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
     file_location = os.path.join(UPLOAD_DIR, file.filename)
 
-    with open(file_location, "wb+") as f:
-        f.write(await file.read())
+    # 写盘放到线程中执行，避免大文件上传阻塞事件循环
+    await asyncio.to_thread(_save_upload_file, file, file_location)
 
     # 假设你静态目录挂载了 /uploads
     return R.success({"url": f"/uploads/{file.filename}"})
@@ -401,6 +622,7 @@ async def handle_single_video_generation(
 
 @router.get("/task_status/{task_id}")
 def get_task_status(task_id: str):
+    paths = _task_paths(task_id)
     # 首先检查任务队列中的状态
     queue_task = task_queue.get_task_status(task_id)
     if queue_task:
@@ -421,10 +643,9 @@ def get_task_status(task_id: str):
             return R.error(queue_task.error_message or "任务失败", code=500)
         elif queue_task.status == QueueTaskStatus.SUCCESS:
             # 任务成功，尝试读取结果文件
-            result_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.json")
+            result_path = paths.result
             if os.path.exists(result_path):
-                with open(result_path, "r", encoding="utf-8") as f:
-                    result_content = json.load(f)
+                result_content = _load_json_file(result_path)
                 return R.success({
                     "status": mapped_status,
                     "result": result_content,
@@ -447,13 +668,12 @@ def get_task_status(task_id: str):
             })
     
     # 任务队列中找不到，检查文件系统
-    status_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.status.json")
-    result_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.json")
+    status_path = paths.status
+    result_path = paths.result
 
     # 优先读状态文件
     if os.path.exists(status_path):
-        with open(status_path, "r", encoding="utf-8") as f:
-            status_content = json.load(f)
+        status_content = _load_json_file(status_path)
 
         status = status_content.get("status")
         message = status_content.get("message", "")
@@ -461,8 +681,7 @@ def get_task_status(task_id: str):
         if status == TaskStatus.SUCCESS.value:
             # 成功状态的话，继续读取最终笔记内容
             if os.path.exists(result_path):
-                with open(result_path, "r", encoding="utf-8") as rf:
-                    result_content = json.load(rf)
+                result_content = _load_json_file(result_path)
                 return R.success({
                     "status": status,
                     "result": result_content,
@@ -489,8 +708,7 @@ def get_task_status(task_id: str):
 
     # 没有状态文件，但有结果
     if os.path.exists(result_path):
-        with open(result_path, "r", encoding="utf-8") as f:
-            result_content = json.load(f)
+        result_content = _load_json_file(result_path)
         return R.success({
             "status": TaskStatus.SUCCESS.value,
             "result": result_content,
@@ -534,8 +752,6 @@ async def image_proxy(request: Request, url: str):
 
 # 任务处理逻辑已移至 app/core/task_queue.py 中的 TaskQueue 类
 
-import asyncio
-import threading
 from typing import List, Tuple
 
 async def extract_collection_videos_with_timeout(
@@ -674,10 +890,9 @@ def retry_task(task_id: str):
                 return R.error("任务重试失败，请检查任务状态")
         
         # 任务队列中没有，检查文件系统中的任务
-        status_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.status.json")
+        status_path = _task_paths(task_id).status
         if os.path.exists(status_path):
-            with open(status_path, "r", encoding="utf-8") as f:
-                status_content = json.load(f)
+            status_content = _load_json_file(status_path)
             
             status = status_content.get("status")
             if status == TaskStatus.FAILED.value:
@@ -742,8 +957,7 @@ def batch_retry_non_success_tasks():
                     if task_queue.get_task_status(task_id):
                         continue
                     
-                    with open(status_file, "r", encoding="utf-8") as f:
-                        status_content = json.load(f)
+                    status_content = _load_json_file(status_file)
                     
                     status = status_content.get("status")
                     if status and status != TaskStatus.SUCCESS.value:
@@ -788,21 +1002,46 @@ def batch_retry_non_success_tasks():
         logger.error(f"❌ 批量重试非成功任务出错: {e}")
         return R.error(f"批量重试非成功任务失败: {str(e)}")
 
+# 最近成功重置的任务（task_id -> 重置时间），用于吸收前端短时间内的重复重试
+_RECENT_RESETS: dict = {}
+_recent_resets_lock = threading.Lock()
+_RESET_DEBOUNCE_SECONDS = 5.0
+_RESET_RECORD_TTL_SECONDS = 60.0
+
+
+def _is_recently_reset(task_id: str, now: float) -> bool:
+    """任务在防抖窗口内已重置且仍在队列中时返回 True"""
+    with _recent_resets_lock:
+        last_reset = _RECENT_RESETS.get(task_id)
+    if last_reset is None or now - last_reset >= _RESET_DEBOUNCE_SECONDS:
+        return False
+    # 任务已被移出队列（例如手动清空重置）时不能跳过，否则任务会丢失
+    return task_queue.get_task_status(task_id) is not None
+
+
+def _mark_reset(task_id: str, now: float):
+    """记录任务重置时间，并顺带清理过期记录"""
+    with _recent_resets_lock:
+        _RECENT_RESETS[task_id] = now
+        expired = [tid for tid, ts in _RECENT_RESETS.items() if now - ts > _RESET_RECORD_TTL_SECONDS]
+        for tid in expired:
+            del _RECENT_RESETS[tid]
+
+
 def rebuild_task_from_files(task_id: str) -> bool:
     """从文件系统重建任务"""
     try:
-        from app.core.task_queue import TaskType
-        from app.enmus.note_enums import DownloadQuality
-        
         # 检查音频metadata文件（分离文件模式）
-        audio_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}_audio.json")
-        result_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.json")
+        paths = _task_paths(task_id)
+        audio_path = paths.audio_meta
+        result_path = paths.result
+        # 已解析的音频metadata，后续清空重置时直接复用，避免重复读取
+        audio_data = None
         
         # 首先尝试从音频metadata文件获取信息
         if os.path.exists(audio_path):
             try:
-                with open(audio_path, "r", encoding="utf-8") as f:
-                    audio_data = json.load(f)
+                audio_data = _load_json_file(audio_path)
                 
                 video_url = audio_data.get("file_path", "")
                 platform = audio_data.get("platform", "")
@@ -810,22 +1049,7 @@ def rebuild_task_from_files(task_id: str) -> bool:
                 
                 if video_url and platform:
                     try:
-                        task_data = {
-                            'video_url': video_url,
-                            'platform': platform,
-                            'quality': DownloadQuality.fast,
-                            'model_name': 'gpt-4o-mini',
-                            'provider_id': 'openai',
-                            'screenshot': False,
-                            'link': False,
-                            'format': [],
-                            'style': '简洁',
-                            'extras': None,
-                            'video_understanding': False,
-                            'video_interval': 0,
-                            'grid_size': [],
-                            'title': title
-                        }
+                        task_data = _build_task_data(video_url, platform, title)
                         
                         task_queue.add_task(
                             task_type=TaskType.SINGLE_VIDEO, 
@@ -836,24 +1060,23 @@ def rebuild_task_from_files(task_id: str) -> bool:
                     except Exception as task_error:
                         logger.error(f"❌ 从音频metadata创建任务失败: {task_id}, {task_error}")
                         # 创建任务失败，但继续尝试清空重置
-                        return clear_and_reset_task(task_id)
+                        return clear_and_reset_task(task_id, audio_data=audio_data)
                     
             except Exception as e:
                 logger.error(f"❌ 从音频metadata重建任务失败: {task_id}, {e}")
                 # 读取音频metadata文件失败，调用删除老记录重新队列执行
-                logger.info(f"🔄 音频metadata文件读取失败，尝试清空重置任务: {task_id}")
-                return clear_and_reset_task(task_id)
+                logger.info("🔄 音频metadata文件读取失败，尝试清空重置任务: %s", task_id)
+                return clear_and_reset_task(task_id, audio_data=audio_data)
         
         # 如果音频文件不存在，尝试从主结果文件读取
         if os.path.exists(result_path):
             try:
-                with open(result_path, "r", encoding="utf-8") as f:
-                    result_data = json.load(f)
+                result_data = _load_json_file(result_path)
                 
                 # 检查是否为错误文件
                 if "error" in result_data:
                     logger.warning(f"⚠️ 发现错误文件，尝试清空重置任务: {task_id}")
-                    return clear_and_reset_task(task_id, result_data)
+                    return clear_and_reset_task(task_id, result_data, audio_data=audio_data)
                 
                 if "audioMeta" in result_data:
                     audio_meta = result_data.get("audioMeta", {})
@@ -863,22 +1086,7 @@ def rebuild_task_from_files(task_id: str) -> bool:
                     
                     if video_url and platform:
                         try:
-                            task_data = {
-                                'video_url': video_url,
-                                'platform': platform,
-                                'quality': DownloadQuality.fast,
-                                'model_name': 'gpt-4o-mini',
-                                'provider_id': 'openai',
-                                'screenshot': False,
-                                'link': False,
-                                'format': [],
-                                'style': '简洁',
-                                'extras': None,
-                                'video_understanding': False,
-                                'video_interval': 0,
-                                'grid_size': [],
-                                'title': title
-                            }
+                            task_data = _build_task_data(video_url, platform, title)
                             
                             task_queue.add_task(
                                 task_type=TaskType.SINGLE_VIDEO, 
@@ -889,218 +1097,182 @@ def rebuild_task_from_files(task_id: str) -> bool:
                         except Exception as task_error:
                             logger.error(f"❌ 从结果文件创建任务失败: {task_id}, {task_error}")
                             # 创建任务失败，但继续尝试清空重置
-                            return clear_and_reset_task(task_id, result_data)
+                            return clear_and_reset_task(task_id, result_data, audio_data=audio_data)
                 else:
                     # 结果文件格式不正确，调用删除老记录重新队列执行
                     logger.warning(f"⚠️ 结果文件格式不正确: {task_id}")
-                    logger.info(f"🔄 结果文件格式不正确，尝试清空重置任务: {task_id}")
-                    return clear_and_reset_task(task_id, result_data)
+                    logger.info("🔄 结果文件格式不正确，尝试清空重置任务: %s", task_id)
+                    return clear_and_reset_task(task_id, result_data, audio_data=audio_data)
                         
             except Exception as e:
                 logger.error(f"❌ 从结果文件重建任务失败: {task_id}, {e}")
                 # 读取结果文件失败，调用删除老记录重新队列执行
-                logger.info(f"🔄 结果文件读取失败，尝试清空重置任务: {task_id}")
-                return clear_and_reset_task(task_id)
+                logger.info("🔄 结果文件读取失败，尝试清空重置任务: %s", task_id)
+                return clear_and_reset_task(task_id, audio_data=audio_data)
         else:
             # 未找到任务相关文件，调用删除老记录重新队列执行
             logger.warning(f"⚠️ 未找到任务相关文件: {task_id}")
-            logger.info(f"🔄 未找到任务相关文件，尝试清空重置任务: {task_id}")
-            return clear_and_reset_task(task_id)
+            logger.info("🔄 未找到任务相关文件，尝试清空重置任务: %s", task_id)
+            return clear_and_reset_task(task_id, audio_data=audio_data)
         
         # 如果都无法重建，尝试清空重置
         logger.warning(f"⚠️ 无法重建任务，尝试清空重置: {task_id}")
-        return clear_and_reset_task(task_id)
+        return clear_and_reset_task(task_id, audio_data=audio_data)
         
     except Exception as e:
         logger.error(f"❌ 重建任务出错: {task_id}, {e}")
         return False
 
-def clear_and_reset_task(task_id: str, error_data: dict = None) -> bool:
-    """清空任务相关文件并尝试重置任务"""
+def _reset_source_from_request_file(paths: SimpleNamespace, error_data: dict, audio_data: dict):
+    """1. 从持久化的原始请求数据中提取"""
+    if not os.path.exists(paths.request):
+        return None
+    original_request = _load_request_file_cached(paths.request).get("original_request", {})
+    if original_request and original_request.get("video_url"):
+        return (original_request["video_url"], original_request.get("platform"),
+                original_request.get("title", "重置任务"))
+    return None
+
+
+def _reset_source_from_error_data(paths: SimpleNamespace, error_data: dict, audio_data: dict):
+    """2. 从调用方传入的错误数据（结果文件内容）中提取"""
+    if not error_data or not isinstance(error_data, dict):
+        return None
+    if "url" in error_data:
+        return (error_data["url"], None, "重置任务") if error_data["url"] else None
+    if "video_url" in error_data:
+        return (error_data["video_url"], None, "重置任务") if error_data["video_url"] else None
+    if "request_data" in error_data:
+        request_data = error_data["request_data"]
+        if isinstance(request_data, dict) and request_data.get("video_url"):
+            return (request_data["video_url"], request_data.get("platform"),
+                    request_data.get("title", "重置任务"))
+        return None
+    # 尝试从audioMeta中提取
+    audio_meta = error_data.get("audioMeta")
+    if isinstance(audio_meta, dict):
+        file_path = audio_meta.get("file_path", "")
+        video_id = audio_meta.get("video_id", "")
+        title = audio_meta.get("title", "重置任务")
+        # 如果是BV号，转换为B站URL
+        bv_url = _bilibili_url_from_video_id(video_id) if video_id else None
+        if bv_url:
+            return bv_url, "bilibili", title
+        if file_path and "http" in file_path:
+            return file_path, audio_meta.get("platform", ""), title
+    return None
+
+
+def _reset_source_from_status_file(paths: SimpleNamespace, error_data: dict, audio_data: dict):
+    """3. 从任务状态文件中提取"""
+    if not os.path.exists(paths.status):
+        return None
+    status_data = _load_json_file(paths.status)
+    orig_req = status_data.get("original_request")
+    if orig_req and orig_req.get("video_url"):
+        return orig_req["video_url"], orig_req.get("platform"), orig_req.get("title", "重置任务")
+    return None
+
+
+def _reset_source_from_audio_meta(paths: SimpleNamespace, error_data: dict, audio_data: dict):
+    """4. 从音频metadata（优先使用调用方已解析的内容）中提取"""
+    if audio_data is None:
+        if not os.path.exists(paths.audio_meta):
+            return None
+        audio_data = _load_json_file(paths.audio_meta)
+    
+    file_path = audio_data.get("file_path", "")
+    video_id = audio_data.get("video_id", "")
+    platform = audio_data.get("platform", "")
+    title = audio_data.get("title", "重置任务")
+    raw_info = audio_data.get("raw_info", {})
+    
+    # 优先检查 raw_info 中是否有原始URL信息
+    if raw_info and isinstance(raw_info, dict):
+        url = raw_info.get("webpage_url") or raw_info.get("original_url")
+        if url:
+            return url, platform, title
+    
+    # 如果 raw_info 中没有，尝试用 video_id 重构（支持 BV1pwj2zxEL9_p64 这类分P信息）
+    if video_id:
+        bv_url = _bilibili_url_from_video_id(video_id)
+        if bv_url:
+            logger.info("🔄 重构视频URL: %s -> %s", video_id, bv_url)
+            return bv_url, "bilibili", title
+        logger.warning(f"⚠️ 无法识别的video_id格式: {video_id}")
+    
+    # 最后检查file_path是否包含HTTP URL（用于其他平台）
+    if file_path and "http" in file_path:
+        return file_path, platform, title
+    return None
+
+
+# clear_and_reset_task 提取原始URL的来源，按优先级排列
+_RESET_SOURCES = (
+    ("持久化请求数据", _reset_source_from_request_file),
+    ("错误数据", _reset_source_from_error_data),
+    ("状态文件", _reset_source_from_status_file),
+    ("音频metadata文件", _reset_source_from_audio_meta),
+)
+
+
+def clear_and_reset_task(task_id: str, error_data: dict = None, audio_data: dict = None) -> bool:
+    """清空任务相关文件并尝试重置任务
+
+    error_data / audio_data 为调用方已解析过的结果文件和音频metadata内容，传入后不再重复读取文件。
+    """
     try:
-        from app.core.task_queue import TaskType
-        from app.enmus.note_enums import DownloadQuality
+        now = time.time()
+        if _is_recently_reset(task_id, now):
+            logger.info("⏭️ 任务 %.0f 秒内已重置过，跳过重复重置: %s", _RESET_DEBOUNCE_SECONDS, task_id)
+            return True
         
-        logger.info(f"🧹 开始清空重置任务: {task_id}")
+        logger.info("🧹 开始清空重置任务: %s", task_id)
         
-        # 尝试从多个来源提取原始信息
+        # 按优先级依次尝试各个来源提取原始信息，命中即停止
         original_url = None
         original_platform = None
         original_title = "重置任务"
         
-        # 1. 优先从持久化的原始请求数据中提取
-        request_file_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.request.json")
-        if os.path.exists(request_file_path):
+        paths = _task_paths(task_id)
+        
+        for source_name, extractor in _RESET_SOURCES:
             try:
-                with open(request_file_path, "r", encoding="utf-8") as f:
-                    request_data = json.load(f)
-                
-                original_request = request_data.get("original_request", {})
-                if original_request:
-                    original_url = original_request.get("video_url")
-                    original_platform = original_request.get("platform")
-                    original_title = original_request.get("title", "重置任务")
-                    
-                    if original_url:
-                        logger.info(f"✅ 从持久化请求数据中找到原始URL: {original_url}")
-                        
+                hit = extractor(paths, error_data, audio_data)
             except Exception as e:
-                logger.warning(f"⚠️ 读取持久化请求数据失败: {e}")
-        
-        # 2. 如果持久化数据中没有找到，尝试从错误数据中提取
-        if not original_url and error_data and isinstance(error_data, dict):
-            # 尝试从错误信息中提取原始URL
-            if "url" in error_data:
-                original_url = error_data["url"]
-            elif "video_url" in error_data:
-                original_url = error_data["video_url"]
-            elif "request_data" in error_data:
-                request_data = error_data["request_data"]
-                if isinstance(request_data, dict):
-                    original_url = request_data.get("video_url")
-                    original_platform = request_data.get("platform")
-                    original_title = request_data.get("title", "重置任务")
-            # 尝试从audioMeta中提取
-            elif "audioMeta" in error_data:
-                audio_meta = error_data["audioMeta"]
-                if isinstance(audio_meta, dict):
-                    file_path = audio_meta.get("file_path", "")
-                    video_id = audio_meta.get("video_id", "")
-                    original_platform = audio_meta.get("platform", "")
-                    original_title = audio_meta.get("title", "重置任务")
-                    
-                    # 如果是BV号，转换为B站URL
-                    if video_id and video_id.startswith("BV"):
-                        original_url = f"https://www.bilibili.com/video/{video_id}"
-                        original_platform = "bilibili"
-                    elif file_path and "http" in file_path:
-                        original_url = file_path
-        
-        # 3. 如果错误数据中没有找到，尝试从任务状态文件中提取
-        if not original_url:
-            status_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.status.json")
-            if os.path.exists(status_path):
-                try:
-                    with open(status_path, "r", encoding="utf-8") as f:
-                        status_data = json.load(f)
-                    
-                    # 从状态文件中提取原始信息
-                    if "original_request" in status_data:
-                        orig_req = status_data["original_request"]
-                        original_url = orig_req.get("video_url")
-                        original_platform = orig_req.get("platform")
-                        original_title = orig_req.get("title", "重置任务")
-                except Exception as e:
-                    logger.warning(f"⚠️ 读取状态文件失败: {e}")
-        
-        # 4. 如果还是没有找到，尝试从音频metadata文件中提取
-        if not original_url:
-            audio_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}_audio.json")
-            if os.path.exists(audio_path):
-                try:
-                    with open(audio_path, "r", encoding="utf-8") as f:
-                        audio_data = json.load(f)
-                    
-                    file_path = audio_data.get("file_path", "")
-                    video_id = audio_data.get("video_id", "")
-                    original_platform = audio_data.get("platform", "")
-                    original_title = audio_data.get("title", "重置任务")
-                    raw_info = audio_data.get("raw_info", {})
-                    
-                    # 优先检查 raw_info 中是否有原始URL信息
-                    if raw_info and isinstance(raw_info, dict):
-                        if "webpage_url" in raw_info:
-                            original_url = raw_info["webpage_url"]
-                            logger.info(f"🔍 从raw_info中找到原始URL: {original_url}")
-                        elif "original_url" in raw_info:
-                            original_url = raw_info["original_url"]
-                            logger.info(f"🔍 从raw_info中找到原始URL: {original_url}")
-                    
-                    # 如果 raw_info 中没有，尝试用 video_id 重构
-                    if not original_url and video_id:
-                        if video_id.startswith("BV"):
-                            # 检查 video_id 中是否包含分P信息（例如：BV1pwj2zxEL9_p64）
-                            if "_p" in video_id:
-                                base_bv, p_part = video_id.split("_p", 1)
-                                try:
-                                    p_num = int(p_part)
-                                    original_url = f"https://www.bilibili.com/video/{base_bv}?p={p_num}"
-                                    logger.info(f"🔄 重构分P视频URL: {video_id} -> {original_url}")
-                                except ValueError:
-                                    # 分P编号无效，使用基础BV号
-                                    original_url = f"https://www.bilibili.com/video/{base_bv}"
-                                    logger.info(f"🔄 重构视频URL (忽略无效分P): {video_id} -> {original_url}")
-                            else:
-                                # 普通BV号
-                                original_url = f"https://www.bilibili.com/video/{video_id}"
-                                logger.info(f"🔄 重构视频URL: {video_id} -> {original_url}")
-                            original_platform = "bilibili"
-                        else:
-                            logger.warning(f"⚠️ 无法识别的video_id格式: {video_id}")
-                    
-                    # 最后检查file_path是否包含HTTP URL（用于其他平台）
-                    if not original_url and file_path and "http" in file_path:
-                        original_url = file_path
-                        logger.info(f"🔄 使用file_path作为URL: {file_path}")
-                        
-                except Exception as e:
-                    logger.warning(f"⚠️ 读取音频metadata文件失败: {e}")
+                logger.warning(f"⚠️ 读取{source_name}失败: {e}")
+                continue
+            if hit:
+                original_url, original_platform, original_title = hit
+                logger.info("✅ 从%s中找到原始URL: %s", source_name, original_url)
+                break
         
         # 清空相关文件（保留原始请求数据文件）
-        files_to_clean = [
-            f"{task_id}.json",          # 结果文件
-            f"{task_id}.status.json",   # 状态文件
-            # f"{task_id}.request.json",  # 🔒 保留原始请求数据文件，不删除
-            f"{task_id}_audio.json",    # 音频metadata文件
-            f"{task_id}_audio.wav",     # 音频文件
-            f"{task_id}_audio.mp3",     # 音频文件
-            f"{task_id}.wav",           # 音频文件
-            f"{task_id}.mp3",           # 音频文件
+        suffixes_to_clean = [
+            ".json",          # 结果文件
+            ".status.json",   # 状态文件
+            # ".request.json",  # 🔒 保留原始请求数据文件，不删除
+            "_audio.json",    # 音频metadata文件
+            "_audio.wav",     # 音频文件
+            "_audio.mp3",     # 音频文件
+            ".wav",           # 音频文件
+            ".mp3",           # 音频文件
         ]
         
-        cleaned_files = []
-        for filename in files_to_clean:
-            file_path = os.path.join(NOTE_OUTPUT_DIR, filename)
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                    cleaned_files.append(filename)
-                    logger.info(f"🗑️ 已删除文件: {filename}")
-                except Exception as e:
-                    logger.warning(f"⚠️ 删除文件失败 {filename}: {e}")
+        cleaned_files = _remove_files_batch([paths.prefix + suffix for suffix in suffixes_to_clean])
         
-        logger.info(f"🧹 清理完成，删除了 {len(cleaned_files)} 个文件")
+        logger.info("🧹 清理完成，删除了 %s 个文件", len(cleaned_files))
         
         # 如果找到了原始URL，重新创建任务
         if original_url:
             # 尝试识别平台
             if not original_platform:
-                if "bilibili.com" in original_url or "b23.tv" in original_url:
-                    original_platform = "bilibili"
-                elif "youtube.com" in original_url or "youtu.be" in original_url:
-                    original_platform = "youtube"
-                else:
-                    original_platform = "unknown"
+                original_platform = _detect_platform_from_url(original_url)
             
-            logger.info(f"🔄 使用原始URL重新创建任务: {original_url}")
+            logger.info("🔄 使用原始URL重新创建任务: %s", original_url)
             
             try:
-                task_data = {
-                    'video_url': original_url,
-                    'platform': original_platform,
-                    'quality': DownloadQuality.fast,
-                    'model_name': 'gpt-4o-mini',
-                    'provider_id': 'openai',
-                    'screenshot': False,
-                    'link': False,
-                    'format': [],
-                    'style': '简洁',
-                    'extras': None,
-                    'video_understanding': False,
-                    'video_interval': 0,
-                    'grid_size': [],
-                    'title': original_title
-                }
+                task_data = _build_task_data(original_url, original_platform, original_title)
                 
                 # 使用原task_id重新创建任务
                 new_task_id = task_queue.add_task(
@@ -1109,7 +1281,7 @@ def clear_and_reset_task(task_id: str, error_data: dict = None) -> bool:
                     task_id=task_id
                 )
                 
-                logger.info(f"✅ 任务队列添加成功: {task_id}")
+                logger.info("✅ 任务队列添加成功: %s", task_id)
                 
                 # 更新原始请求数据文件（保存新的任务数据）
                 try:
@@ -1118,34 +1290,19 @@ def clear_and_reset_task(task_id: str, error_data: dict = None) -> bool:
                         "created_at": time.time(),
                         "created_at_iso": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()),
                         "reset_count": 1,  # 标记这是重置任务
-                        "original_request": {
-                            "video_url": original_url,
-                            "platform": original_platform,
-                            "title": original_title,
-                            "quality": task_data.get('quality', DownloadQuality.fast),
-                            "model_name": task_data.get('model_name', 'gpt-4o-mini'),
-                            "provider_id": task_data.get('provider_id', 'openai'),
-                            "screenshot": task_data.get('screenshot', False),
-                            "link": task_data.get('link', False),
-                            "format": task_data.get('format', []),
-                            "style": task_data.get('style', '简洁'),
-                            "extras": task_data.get('extras', None),
-                            "video_understanding": task_data.get('video_understanding', False),
-                            "video_interval": task_data.get('video_interval', 0),
-                            "grid_size": task_data.get('grid_size', [])
-                        }
+                        # task_data 刚由 _build_task_data 构建，已包含全部字段，直接写入即可
+                        "original_request": task_data
                     }
                     
-                    request_file_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.request.json")
-                    with open(request_file_path, "w", encoding="utf-8") as f:
-                        json.dump(updated_request_data, f, ensure_ascii=False, indent=2)
+                    _dump_request_file(paths.request, updated_request_data)
                     
-                    logger.info(f"📝 已更新原始请求数据文件: {task_id}")
+                    logger.info("📝 已更新原始请求数据文件: %s", task_id)
                     
                 except Exception as save_error:
                     logger.warning(f"⚠️ 更新原始请求数据文件失败: {save_error}")
                 
-                logger.info(f"✅ 任务清空重置成功: {task_id} -> 新URL: {original_url}")
+                _mark_reset(task_id, now)
+                logger.info("✅ 任务清空重置成功: %s -> 新URL: %s", task_id, original_url)
                 return True
                 
             except Exception as task_create_error:
@@ -1166,85 +1323,103 @@ class ValidateTasksRequest(BaseModel):
     """验证任务请求模型"""
     task_ids: List[str]
 
-@router.post("/validate_tasks")
-def validate_tasks(request: ValidateTasksRequest):
+def _validate_task_from_files(task_id: str) -> dict:
+    """根据文件系统中的状态/结果文件判断任务状态（阻塞 I/O，在线程中执行）"""
+    paths = _task_paths(task_id)
+    
+    if os.path.exists(paths.status):
+        try:
+            status_content = _load_json_file(paths.status)
+            status = status_content.get("status")
+            return {
+                "task_id": task_id,
+                "exists_in_queue": False,
+                "status": status,
+                "needs_retry": status != TaskStatus.SUCCESS.value,
+                "error_message": status_content.get("message")
+            }
+        except Exception as e:
+            return {
+                "task_id": task_id,
+                "exists_in_queue": False,
+                "status": "UNKNOWN",
+                "needs_retry": True,
+                "error_message": f"读取状态文件失败: {str(e)}"
+            }
+    
+    if os.path.exists(paths.result):
+        # 只有结果文件，说明任务已完成
+        return {
+            "task_id": task_id,
+            "exists_in_queue": False,
+            "status": TaskStatus.SUCCESS.value,
+            "needs_retry": False,
+            "error_message": None
+        }
+    
+    # 什么都没有，任务不存在
+    return {
+        "task_id": task_id,
+        "exists_in_queue": False,
+        "status": "NOT_FOUND",
+        "needs_retry": False,
+        "error_message": "任务不存在"
+    }
+
+
+@router.post("/validate_tasks", response_class=ORJSONResponse)
+async def validate_tasks(request: ValidateTasksRequest):
     """验证前端任务ID列表，返回真正需要重试的任务状态"""
     try:
         task_ids = request.task_ids
-        validation_results = []
+        validation_results = [None] * len(task_ids)
+        needs_retry_count = 0
         
-        for task_id in task_ids:
+        # 不在队列中的任务需要查文件系统，统一放到线程中并发执行，避免阻塞事件循环
+        file_check_indexes = []
+        
+        for index, task_id in enumerate(task_ids):
             # 检查任务队列中的状态
             queue_task = task_queue.get_task_status(task_id)
             if queue_task:
                 # 任务在队列中，返回队列状态
-                validation_results.append({
+                needs_retry = queue_task.status != QueueTaskStatus.SUCCESS
+                needs_retry_count += needs_retry
+                validation_results[index] = {
                     "task_id": task_id,
                     "exists_in_queue": True,
                     "status": queue_task.status.value,
-                    "needs_retry": queue_task.status != QueueTaskStatus.SUCCESS,
+                    "needs_retry": needs_retry,
                     "error_message": queue_task.error_message
-                })
+                }
             else:
-                # 任务不在队列中，检查文件系统
-                status_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.status.json")
-                result_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.json")
-                
-                if os.path.exists(status_path):
-                    try:
-                        with open(status_path, "r", encoding="utf-8") as f:
-                            status_content = json.load(f)
-                        status = status_content.get("status")
-                        validation_results.append({
-                            "task_id": task_id,
-                            "exists_in_queue": False,
-                            "status": status,
-                            "needs_retry": status != TaskStatus.SUCCESS.value,
-                            "error_message": status_content.get("message")
-                        })
-                    except Exception as e:
-                        validation_results.append({
-                            "task_id": task_id,
-                            "exists_in_queue": False,
-                            "status": "UNKNOWN",
-                            "needs_retry": True,
-                            "error_message": f"读取状态文件失败: {str(e)}"
-                        })
-                elif os.path.exists(result_path):
-                    # 只有结果文件，说明任务已完成
-                    validation_results.append({
-                        "task_id": task_id,
-                        "exists_in_queue": False,
-                        "status": TaskStatus.SUCCESS.value,
-                        "needs_retry": False,
-                        "error_message": None
-                    })
-                else:
-                    # 什么都没有，任务不存在
-                    validation_results.append({
-                        "task_id": task_id,
-                        "exists_in_queue": False,
-                        "status": "NOT_FOUND",
-                        "needs_retry": False,
-                        "error_message": "任务不存在"
-                    })
+                file_check_indexes.append(index)
+        
+        if file_check_indexes:
+            file_results = await asyncio.gather(*(
+                asyncio.to_thread(_validate_task_from_files, task_ids[index])
+                for index in file_check_indexes
+            ))
+            for index, result in zip(file_check_indexes, file_results):
+                needs_retry_count += result["needs_retry"]
+                validation_results[index] = result
         
         # 统计结果
-        needs_retry_count = len([r for r in validation_results if r["needs_retry"]])
         total_tasks = len(validation_results)
         
         logger.info(f"✅ 任务验证完成: 总数={total_tasks}, 需重试={needs_retry_count}")
         
-        return R.success({
+        # 结果列表可能很大，直接用 orjson 序列化，跳过 jsonable_encoder 和标准库 json
+        return ORJSONResponse(R.success({
             "validation_results": validation_results,
             "total_tasks": total_tasks,
             "needs_retry_count": needs_retry_count,
             "message": f"验证完成：{total_tasks}个任务中有{needs_retry_count}个需要重试"
-        })
+        }))
         
     except Exception as e:
         logger.error(f"❌ 验证任务状态出错: {e}")
-        return R.error(f"验证任务状态失败: {str(e)}")
+        return ORJSONResponse(R.error(f"验证任务状态失败: {str(e)}"))
 
 class ForceRetryRequest(BaseModel):
     """强制重试请求模型"""
@@ -1255,28 +1430,37 @@ class ForceRetryRequest(BaseModel):
     video_understanding: Optional[bool] = None
     video_interval: Optional[int] = None
 
+
+# 强制重试时可覆盖的配置项：前者为空值不覆盖，后者仅在显式传入（非 None）时覆盖
+_RETRY_TRUTHY_FIELDS = ("model_name", "provider_id", "style", "format")
+_RETRY_NOT_NONE_FIELDS = ("video_understanding", "video_interval")
+
+
+def _retry_overrides(request: Optional[ForceRetryRequest]) -> dict:
+    """从强制重试请求中提取需要覆盖到任务数据的新配置"""
+    if request is None:
+        return {}
+    overrides = {}
+    for name in _RETRY_TRUTHY_FIELDS:
+        value = getattr(request, name)
+        if value:
+            overrides[name] = value
+    for name in _RETRY_NOT_NONE_FIELDS:
+        value = getattr(request, name)
+        if value is not None:
+            overrides[name] = value
+    return overrides
+
+
 @router.post("/force_retry_all")
 def force_retry_all_tasks(request: Optional[ForceRetryRequest] = None):
     """强制重试所有任务，使用最新配置"""
     try:
         # 构建新的任务配置
-        new_task_data = {}
-        if request:
-            if request.model_name:
-                new_task_data['model_name'] = request.model_name
-            if request.provider_id:
-                new_task_data['provider_id'] = request.provider_id
-            if request.style:
-                new_task_data['style'] = request.style
-            if request.format:
-                new_task_data['format'] = request.format
-            if request.video_understanding is not None:
-                new_task_data['video_understanding'] = request.video_understanding
-            if request.video_interval is not None:
-                new_task_data['video_interval'] = request.video_interval
+        new_task_data = _retry_overrides(request)
         
         result = task_queue.force_retry_all_tasks(new_task_data if new_task_data else None)
-        logger.info(f"✅ 强制批量重试所有任务完成: {result}")
+        logger.info("✅ 强制批量重试所有任务完成: %s", result)
         
         return R.success({
             "retried_count": result["retried_count"],
@@ -1293,7 +1477,8 @@ def force_retry_all_tasks(request: Optional[ForceRetryRequest] = None):
 def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
     """强制重试单个任务（包括成功状态的任务）"""
     try:
-        from app.core.task_queue import TaskStatus as QueueTaskStatus, TaskType
+        # 请求中携带的新配置，重建任务时覆盖原有/默认配置
+        retry_overrides = _retry_overrides(request)
         
         # 首先检查任务队列中是否存在该任务
         queue_task = task_queue.get_task_status(task_id)
@@ -1303,18 +1488,8 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                 task = task_queue.tasks.get(task_id)
                 if task:
                     # 如果有新的配置，更新任务数据
-                    if request and hasattr(request, 'model_name') and request.model_name:
-                        task.data['model_name'] = request.model_name
-                    if request and hasattr(request, 'provider_id') and request.provider_id:
-                        task.data['provider_id'] = request.provider_id
-                    if request and hasattr(request, 'style') and request.style:
-                        task.data['style'] = request.style
-                    if request and hasattr(request, 'format') and request.format:
-                        task.data['format'] = request.format
-                    if request and hasattr(request, 'video_understanding') and request.video_understanding is not None:
-                        task.data['video_understanding'] = request.video_understanding
-                    if request and hasattr(request, 'video_interval') and request.video_interval is not None:
-                        task.data['video_interval'] = request.video_interval
+                    if retry_overrides:
+                        task.data.update(retry_overrides)
                     
                     # 重置任务状态
                     task.status = QueueTaskStatus.PENDING
@@ -1326,7 +1501,7 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                     # 重新提交到队列
                     task_queue.task_queue.put(task)
                     
-                    logger.info(f"✅ 强制重试任务成功: {task_id}")
+                    logger.info("✅ 强制重试任务成功: %s", task_id)
                     return R.success({
                         "message": "任务已强制重新提交，请等待处理",
                         "task_id": task_id
@@ -1335,7 +1510,7 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                     return R.error("任务不存在")
         
         # 任务不在队列中，优先尝试从持久化的原始请求数据重建
-        logger.info(f"🔍 任务不在队列中，尝试从持久化的原始请求数据重建: {task_id}")
+        logger.info("🔍 任务不在队列中，尝试从持久化的原始请求数据重建: %s", task_id)
         
         try:
             # 加载持久化的原始请求数据
@@ -1348,25 +1523,8 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                 
                 if video_url and platform:
                     try:
-                        from app.enmus.note_enums import DownloadQuality
-                        
                         # 构建任务数据，使用持久化数据，可能会被请求中的新配置覆盖
-                        task_data = {
-                            'video_url': video_url,
-                            'platform': platform,
-                            'quality': original_request_data.get('quality', DownloadQuality.fast),
-                            'model_name': request.model_name if request and request.model_name else original_request_data.get('model_name', 'gpt-4o-mini'),
-                            'provider_id': request.provider_id if request and request.provider_id else original_request_data.get('provider_id', 'openai'),
-                            'screenshot': original_request_data.get('screenshot', False),
-                            'link': original_request_data.get('link', False),
-                            'format': request.format if request and request.format else original_request_data.get('format', []),
-                            'style': request.style if request and request.style else original_request_data.get('style', '简洁'),
-                            'extras': original_request_data.get('extras', None),
-                            'video_understanding': request.video_understanding if request and request.video_understanding is not None else original_request_data.get('video_understanding', False),
-                            'video_interval': request.video_interval if request and request.video_interval is not None else original_request_data.get('video_interval', 0),
-                            'grid_size': original_request_data.get('grid_size', []),
-                            'title': title
-                        }
+                        task_data = _build_task_data(video_url, platform, title, base=original_request_data, **retry_overrides)
                         
                         # 使用原task_id重新创建任务
                         new_task_id = task_queue.add_task(
@@ -1375,7 +1533,7 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                             task_id=task_id  # 使用原有的task_id
                         )
                         
-                        logger.info(f"✅ 从持久化原始请求数据重建任务成功: {task_id}, 标题: {title}")
+                        logger.info("✅ 从持久化原始请求数据重建任务成功: %s, 标题: %s", task_id, title)
                         return R.success({
                             "message": f"任务已从持久化数据重建并重新提交，标题: {title}",
                             "task_id": task_id,
@@ -1388,23 +1546,26 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                 else:
                     logger.warning(f"⚠️ 持久化数据中缺少必要的video_url或platform: {task_id}")
             else:
-                logger.info(f"📋 未找到持久化的原始请求数据: {task_id}")
+                logger.info("📋 未找到持久化的原始请求数据: %s", task_id)
                 
         except Exception as e:
             logger.error(f"❌ 从持久化数据重建任务失败: {task_id}, {e}")
         
         # 任务不在队列中，且没有持久化数据，尝试从文件系统重建任务
-        logger.info(f"🔍 尝试从文件系统重建任务: {task_id}")
+        logger.info("🔍 尝试从文件系统重建任务: %s", task_id)
         
         # 检查结果文件是否存在（包含原始任务数据）
-        result_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.json")
-        audio_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}_audio.json")
+        paths = _task_paths(task_id)
+        result_path = paths.result
+        audio_path = paths.audio_meta
+        
+        # 已解析的音频metadata，后续清空重置时直接复用，避免重复读取
+        audio_data = None
         
         # 首先尝试从音频metadata文件获取信息（分离文件模式）
         if os.path.exists(audio_path):
             try:
-                with open(audio_path, "r", encoding="utf-8") as f:
-                    audio_data = json.load(f)
+                audio_data = _load_json_file(audio_path)
                 
                 # 从音频文件提取原始任务数据
                 video_url = audio_data.get("file_path", "")
@@ -1414,24 +1575,7 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                 if video_url and platform:
                     try:
                         # 重建任务数据（使用默认配置）
-                        from app.enmus.note_enums import DownloadQuality
-                        
-                        task_data = {
-                            'video_url': video_url,
-                            'platform': platform,
-                            'quality': DownloadQuality.fast,
-                            'model_name': request.model_name if request and request.model_name else 'gpt-4o-mini',
-                            'provider_id': request.provider_id if request and request.provider_id else 'openai',
-                            'screenshot': False,
-                            'link': False,
-                            'format': request.format if request and request.format else [],
-                            'style': request.style if request and request.style else '简洁',
-                            'extras': None,
-                            'video_understanding': request.video_understanding if request and request.video_understanding is not None else False,
-                            'video_interval': request.video_interval if request and request.video_interval is not None else 0,
-                            'grid_size': [],
-                            'title': title
-                        }
+                        task_data = _build_task_data(video_url, platform, title, **retry_overrides)
                         
                         # 使用原task_id重新创建任务
                         new_task_id = task_queue.add_task(
@@ -1440,7 +1584,7 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                             task_id=task_id  # 使用原有的task_id
                         )
                         
-                        logger.info(f"✅ 从音频metadata文件重建任务成功: {task_id}")
+                        logger.info("✅ 从音频metadata文件重建任务成功: %s", task_id)
                         return R.success({
                             "message": f"任务已从音频文件重建并重新提交，标题: {title}",
                             "task_id": task_id
@@ -1452,8 +1596,8 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
             except Exception as e:
                 logger.error(f"❌ 读取音频metadata文件失败: {task_id}, {e}")
                 # 第一种失败：读取音频metadata文件失败，调用删除老记录重新队列执行
-                logger.info(f"🔄 读取音频metadata文件失败，尝试清空重置任务: {task_id}")
-                success = clear_and_reset_task(task_id)
+                logger.info("🔄 读取音频metadata文件失败，尝试清空重置任务: %s", task_id)
+                success = clear_and_reset_task(task_id, audio_data=audio_data)
                 if success:
                     return R.success({
                         "message": "音频文件读取失败，已清空重置并重新提交任务",
@@ -1465,13 +1609,13 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
         # 如果音频文件不存在或失败，尝试从主结果文件读取
         if os.path.exists(result_path):
             try:
-                with open(result_path, "r", encoding="utf-8") as f:
-                    result_data = json.load(f)
+                # 只保留元数据字段，避免在后续重建/重置流程中持有完整的转写内容
+                result_meta, has_transcript = _peek_result_meta(result_path)
                 
                 # 检查是否为错误文件
-                if "error" in result_data:
+                if "error" in result_meta:
                     logger.warning(f"⚠️ 发现错误文件，尝试清空重置任务: {task_id}")
-                    success = clear_and_reset_task(task_id, result_data)
+                    success = clear_and_reset_task(task_id, result_meta, audio_data=audio_data)
                     if success:
                         return R.success({
                             "message": "发现错误文件，已清空重置并重新提交任务",
@@ -1481,9 +1625,9 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                         return R.error("发现错误文件，清空重置任务失败")
                 
                 # 从结果文件中提取原始任务数据
-                if "audioMeta" in result_data and "transcript" in result_data:
+                if "audioMeta" in result_meta and has_transcript:
                     # 这是一个完整的结果文件，包含原始数据
-                    audio_meta = result_data.get("audioMeta", {})
+                    audio_meta = result_meta.get("audioMeta", {})
                     video_url = audio_meta.get("file_path", "")
                     platform = audio_meta.get("platform", "")
                     title = audio_meta.get("title", "未知标题")
@@ -1491,24 +1635,7 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                     if video_url and platform:
                         try:
                             # 重建任务数据（使用默认配置）
-                            from app.enmus.note_enums import DownloadQuality
-                            
-                            task_data = {
-                                'video_url': video_url,
-                                'platform': platform,
-                                'quality': DownloadQuality.fast,
-                                'model_name': request.model_name if request and request.model_name else 'gpt-4o-mini',
-                                'provider_id': request.provider_id if request and request.provider_id else 'openai',
-                                'screenshot': False,
-                                'link': False,
-                                'format': request.format if request and request.format else [],
-                                'style': request.style if request and request.style else '简洁',
-                                'extras': None,
-                                'video_understanding': request.video_understanding if request and request.video_understanding is not None else False,
-                                'video_interval': request.video_interval if request and request.video_interval is not None else 0,
-                                'grid_size': [],
-                                'title': title
-                            }
+                            task_data = _build_task_data(video_url, platform, title, **retry_overrides)
                             
                             # 使用原task_id重新创建任务
                             new_task_id = task_queue.add_task(
@@ -1517,7 +1644,7 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                                 task_id=task_id  # 使用原有的task_id
                             )
                             
-                            logger.info(f"✅ 从结果文件重建任务成功: {task_id}")
+                            logger.info("✅ 从结果文件重建任务成功: %s", task_id)
                             return R.success({
                                 "message": f"任务已从结果文件重建并重新提交，标题: {title}",
                                 "task_id": task_id
@@ -1526,7 +1653,7 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                             logger.error(f"❌ 从结果文件创建任务失败: {task_id}, {task_error}")
                             logger.warning(f"⚠️ 结果文件创建任务失败，尝试清空重置: {task_id}")
                             # 创建任务失败，尝试清空重置
-                            success = clear_and_reset_task(task_id, result_data)
+                            success = clear_and_reset_task(task_id, result_meta, audio_data=audio_data)
                             if success:
                                 return R.success({
                                     "message": "结果文件创建任务失败，已清空重置并重新提交任务",
@@ -1537,8 +1664,8 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                     else:
                         logger.warning(f"⚠️ 结果文件中缺少必要的视频信息: {task_id}")
                         # 结果文件中缺少必要信息，也调用清空重置
-                        logger.info(f"🔄 结果文件缺少视频信息，尝试清空重置任务: {task_id}")
-                        success = clear_and_reset_task(task_id, result_data)
+                        logger.info("🔄 结果文件缺少视频信息，尝试清空重置任务: %s", task_id)
+                        success = clear_and_reset_task(task_id, result_meta, audio_data=audio_data)
                         if success:
                             return R.success({
                                 "message": "结果文件缺少必要信息，已清空重置并重新提交任务",
@@ -1549,8 +1676,8 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
                 else:
                     logger.warning(f"⚠️ 结果文件格式不正确: {task_id}")
                     # 第二种失败：结果文件格式不正确，调用删除老记录重新队列执行
-                    logger.info(f"🔄 结果文件格式不正确，尝试清空重置任务: {task_id}")
-                    success = clear_and_reset_task(task_id, result_data)
+                    logger.info("🔄 结果文件格式不正确，尝试清空重置任务: %s", task_id)
+                    success = clear_and_reset_task(task_id, result_meta, audio_data=audio_data)
                     if success:
                         return R.success({
                             "message": "结果文件格式不正确，已清空重置并重新提交任务",
@@ -1562,8 +1689,8 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
             except Exception as e:
                 logger.error(f"❌ 读取结果文件失败: {task_id}, {e}")
                 # 读取结果文件失败，也调用清空重置
-                logger.info(f"🔄 读取结果文件失败，尝试清空重置任务: {task_id}")
-                success = clear_and_reset_task(task_id)
+                logger.info("🔄 读取结果文件失败，尝试清空重置任务: %s", task_id)
+                success = clear_and_reset_task(task_id, audio_data=audio_data)
                 if success:
                     return R.success({
                         "message": "结果文件读取失败，已清空重置并重新提交任务",
@@ -1574,8 +1701,8 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
         else:
             logger.warning(f"⚠️ 未找到任务相关文件: {task_id}")
             # 第三种失败：未找到任务相关文件，调用删除老记录重新队列执行
-            logger.info(f"🔄 未找到任务相关文件，尝试清空重置任务: {task_id}")
-            success = clear_and_reset_task(task_id)
+            logger.info("🔄 未找到任务相关文件，尝试清空重置任务: %s", task_id)
+            success = clear_and_reset_task(task_id, audio_data=audio_data)
             if success:
                 return R.success({
                     "message": "未找到任务相关文件，已尝试清空重置任务",
@@ -1588,112 +1715,94 @@ def force_retry_task(task_id: str, request: Optional[ForceRetryRequest] = None):
         logger.error(f"❌ 强制重试任务失败: {e}")
         return R.error(f"强制重试任务失败: {str(e)}")
 
-@router.post("/force_restart_task/{task_id}")
-def force_restart_task(task_id: str):
-    """强制清理并重新开始任务 - 完全从头开始，清理所有相关文件"""
-    try:
-        from app.core.task_queue import TaskStatus as QueueTaskStatus, TaskType
-        import glob
-        
-        logger.info(f"🔥 开始强制重新开始任务: {task_id}")
+def _load_restart_task_data(task_id: str, paths: SimpleNamespace) -> Optional[dict]:
+    """强制重新开始时获取原始任务数据：优先持久化的原始请求数据，其次音频metadata文件"""
+    # 1. 首先尝试从持久化的原始请求数据获取任务数据
+    request_file_path = paths.request
+    task_data = None
+    
+    if os.path.exists(request_file_path):
+        try:
+            request_data = _load_request_file_cached(request_file_path)
+            
+            original_request = request_data.get("original_request", {})
+            if original_request and original_request.get("video_url"):
+                try:
+                    video_url = original_request.get("video_url")
+                    platform = original_request.get("platform", "bilibili")
+                    title = original_request.get("title", "未知标题")
+                    
+                    task_data = _build_task_data(video_url, platform, title, base=original_request)
+                    
+                    logger.info("✅ 从持久化请求数据获取任务数据成功: %s (%s)", title, video_url)
+                except Exception as data_error:
+                    logger.error(f"❌ 从持久化数据构建任务数据失败: {task_id}, {data_error}")
+                    # 如果构建任务数据失败，task_data保持为None
         
-        # 1. 首先尝试从持久化的原始请求数据获取任务数据
-        request_file_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}.request.json")
-        task_data = None
+        except Exception as e:
+            logger.error(f"❌ 读取持久化请求数据失败: {task_id}, {e}")
+    
+    # 2. 如果持久化数据不存在，尝试从音频文件获取原始任务数据
+    if not task_data:
+        audio_path = paths.audio_meta
         
-        if os.path.exists(request_file_path):
+        if os.path.exists(audio_path):
             try:
-                with open(request_file_path, "r", encoding="utf-8") as f:
-                    request_data = json.load(f)
+                audio_data = _load_json_file(audio_path)
                 
-                original_request = request_data.get("original_request", {})
-                if original_request and original_request.get("video_url"):
+                # 从音频文件提取原始任务数据
+                video_url = audio_data.get("file_path", "")
+                # 如果是BV号，转换为B站URL
+                if "BV" in video_url:
+                    video_id = os.path.basename(video_url).replace(".mp3", "")
+                    video_url = f"https://www.bilibili.com/video/{video_id}"
+                elif not video_url.startswith("http"):
+                    # 如果是本地文件路径，尝试从video_id构建URL
+                    video_id = audio_data.get("video_id", "")
+                    if video_id and video_id.startswith("BV"):
+                        video_url = f"https://www.bilibili.com/video/{video_id}"
+                    else:
+                        video_url = audio_data.get("file_path", "")
+                
+                platform = audio_data.get("platform", "bilibili")
+                title = audio_data.get("title", "未知标题")
+                
+                if video_url and platform:
                     try:
-                        video_url = original_request.get("video_url")
-                        platform = original_request.get("platform", "bilibili")
-                        title = original_request.get("title", "未知标题")
+                        # 重建任务数据（使用默认配置，可以后续调整）
+                        task_data = _build_task_data(video_url, platform, title)
                         
-                        from app.enmus.note_enums import DownloadQuality
-                        
-                        task_data = {
-                            'video_url': video_url,
-                            'platform': platform,
-                            'quality': original_request.get('quality', DownloadQuality.fast),
-                            'model_name': original_request.get('model_name', 'gpt-4o-mini'),
-                            'provider_id': original_request.get('provider_id', 'openai'),
-                            'screenshot': original_request.get('screenshot', False),
-                            'link': original_request.get('link', False),
-                            'format': original_request.get('format', []),
-                            'style': original_request.get('style', '简洁'),
-                            'extras': original_request.get('extras', None),
-                            'video_understanding': original_request.get('video_understanding', False),
-                            'video_interval': original_request.get('video_interval', 0),
-                            'grid_size': original_request.get('grid_size', []),
-                            'title': title
-                        }
-                        
-                        logger.info(f"✅ 从持久化请求数据获取任务数据成功: {title} ({video_url})")
+                        logger.info("✅ 从音频文件获取任务数据成功: %s (%s)", title, video_url)
                     except Exception as data_error:
-                        logger.error(f"❌ 从持久化数据构建任务数据失败: {task_id}, {data_error}")
+                        logger.error(f"❌ 构建任务数据失败: {task_id}, {data_error}")
                         # 如果构建任务数据失败，task_data保持为None
-                    
             except Exception as e:
-                logger.error(f"❌ 读取持久化请求数据失败: {task_id}, {e}")
+                logger.error(f"❌ 读取音频文件失败: {task_id}, {e}")
+    
+    return task_data
+
+
+def _cleanup_task_files(task_id: str) -> List[str]:
+    """一次目录遍历找出并删除任务相关文件（结果、状态、原始请求数据以及 {task_id}_*.json/md/txt），返回已删除的文件名"""
+    cleaned_files = []
+    for file_path in _scan_task_files(task_id):
+        filename, removed = _remove_file(file_path)
+        if removed:
+            cleaned_files.append(filename)
+            logger.info("🗑️ 已删除文件: %s", filename)
+    return cleaned_files
+
+
+@router.post("/force_restart_task/{task_id}")
+async def force_restart_task(task_id: str):
+    """强制清理并重新开始任务 - 完全从头开始，清理所有相关文件"""
+    try:
+        logger.info("🔥 开始强制重新开始任务: %s", task_id)
         
-        # 2. 如果持久化数据不存在，尝试从音频文件获取原始任务数据
-        if not task_data:
-            audio_path = os.path.join(NOTE_OUTPUT_DIR, f"{task_id}_audio.json")
-            
-            if os.path.exists(audio_path):
-                try:
-                    with open(audio_path, "r", encoding="utf-8") as f:
-                        audio_data = json.load(f)
-                
-                    # 从音频文件提取原始任务数据
-                    video_url = audio_data.get("file_path", "")
-                    # 如果是BV号，转换为B站URL
-                    if "BV" in video_url:
-                        video_id = os.path.basename(video_url).replace(".mp3", "")
-                        video_url = f"https://www.bilibili.com/video/{video_id}"
-                    elif not video_url.startswith("http"):
-                        # 如果是本地文件路径，尝试从video_id构建URL
-                        video_id = audio_data.get("video_id", "")
-                        if video_id and video_id.startswith("BV"):
-                            video_url = f"https://www.bilibili.com/video/{video_id}"
-                        else:
-                            video_url = audio_data.get("file_path", "")
-                    
-                    platform = audio_data.get("platform", "bilibili")
-                    title = audio_data.get("title", "未知标题")
-                    
-                    if video_url and platform:
-                        try:
-                            # 重建任务数据（使用默认配置，可以后续调整）
-                            from app.enmus.note_enums import DownloadQuality
-                            
-                            task_data = {
-                                'video_url': video_url,
-                                'platform': platform,
-                                'quality': DownloadQuality.fast,
-                                'model_name': 'gpt-4o-mini',  # 默认模型
-                                'provider_id': 'openai',      # 默认提供者
-                                'screenshot': False,
-                                'link': False,
-                                'format': [],
-                                'style': '简洁',
-                                'extras': None,
-                                'video_understanding': False,
-                                'video_interval': 0,
-                                'grid_size': [],
-                                'title': title
-                            }
-                            
-                            logger.info(f"✅ 从音频文件获取任务数据成功: {title} ({video_url})")
-                        except Exception as data_error:
-                            logger.error(f"❌ 构建任务数据失败: {task_id}, {data_error}")
-                            # 如果构建任务数据失败，task_data保持为None
-                except Exception as e:
-                    logger.error(f"❌ 读取音频文件失败: {task_id}, {e}")
+        paths = _task_paths(task_id)
+        
+        # 1. 获取原始任务数据（文件读取放到线程中执行，不阻塞事件循环）
+        task_data = await asyncio.to_thread(_load_restart_task_data, task_id, paths)
         
         # 如果没有获取到任务数据，返回错误
         if not task_data:
@@ -1701,36 +1810,15 @@ def force_restart_task(task_id: str):
             return R.error("无法获取原始任务数据，请确保任务文件存在")
         
         # 2. 清理所有相关文件
-        logger.info(f"🧹 开始清理任务相关文件: {task_id}")
-        
-        # 清理模式列表
-        cleanup_patterns = [
-            f"{task_id}.json",
-            f"{task_id}.status.json", 
-            f"{task_id}.request.json",  # 原始请求数据文件
-            f"{task_id}_*.json",
-            f"{task_id}_*.md",
-            f"{task_id}_*.txt"
-        ]
+        logger.info("🧹 开始清理任务相关文件: %s", task_id)
         
-        cleaned_files = []
-        for pattern in cleanup_patterns:
-            file_pattern = os.path.join(NOTE_OUTPUT_DIR, pattern)
-            matching_files = glob.glob(file_pattern)
-            for file_path in matching_files:
-                try:
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                        cleaned_files.append(os.path.basename(file_path))
-                        logger.info(f"🗑️ 已删除文件: {os.path.basename(file_path)}")
-                except Exception as e:
-                    logger.warning(f"⚠️ 删除文件失败: {os.path.basename(file_path)}, {e}")
+        cleaned_files = await asyncio.to_thread(_cleanup_task_files, task_id)
         
         # 3. 从任务队列中移除旧任务（如果存在）
         with task_queue._lock:
-            if task_id in task_queue.tasks:
-                del task_queue.tasks[task_id]
-                logger.info(f"🗑️ 已从任务队列移除旧任务: {task_id}")
+            removed_task = task_queue.tasks.pop(task_id, None)
+        if removed_task is not None:
+            logger.info("🗑️ 已从任务队列移除旧任务: %s", task_id)
         
         # 4. 创建全新的任务
         try:
@@ -1740,9 +1828,10 @@ def force_restart_task(task_id: str):
                 task_id=task_id  # 使用原有的task_id
             )
             
-            logger.info(f"✅ 强制重新开始任务成功: {task_id}")
-            logger.info(f"📋 任务详情: {task_data.get('title', '未知标题')}")
-            logger.info(f"🧹 清理了 {len(cleaned_files)} 个文件: {', '.join(cleaned_files)}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ 强制重新开始任务成功: %s", task_id)
+                logger.info("📋 任务详情: %s", task_data.get('title', '未知标题'))
+                logger.info("🧹 清理了 %s 个文件: %s", len(cleaned_files), ', '.join(cleaned_files))
             
             return R.success({
                 "message": f"任务已强制重新开始，标题: {task_data.get('title', '未知标题')}",
@@ -1764,19 +1853,19 @@ def force_restart_task(task_id: str):
 def clear_reset_task(task_id: str):
     """清空并重置单个任务（删除所有相关文件并重新创建）"""
     try:
-        logger.info(f"🧹 手动清空重置任务: {task_id}")
+        logger.info("🧹 手动清空重置任务: %s", task_id)
         
         # 首先从队列中移除任务（如果存在）
         with task_queue._lock:
-            if task_id in task_queue.tasks:
-                del task_queue.tasks[task_id]
-                logger.info(f"🗑️ 已从队列中移除任务: {task_id}")
+            removed_task = task_queue.tasks.pop(task_id, None)
+        if removed_task is not None:
+            logger.info("🗑️ 已从队列中移除任务: %s", task_id)
         
         # 执行清空重置
         success = clear_and_reset_task(task_id)
         
         if success:
-            logger.info(f"✅ 任务清空重置成功: {task_id}")
+            logger.info("✅ 任务清空重置成功: %s", task_id)
             return R.success({
                 "message": "任务已清空重置，重新进入队列",
                 "task_id": task_id
@@ -1797,6 +1886,39 @@ class BatchClearResetRequest(BaseModel):
     task_ids: List[str]
     force_clear: Optional[bool] = False  # 是否强制清空（即使无法重新创建）
 
+def _clear_reset_one(task_id: str, force_clear: bool) -> dict:
+    """批量清空重置中的单个任务处理（仅涉及文件读写和重新入队，可在线程池中并发执行）"""
+    try:
+        # 执行清空重置
+        success = clear_and_reset_task(task_id)
+        
+        if success:
+            return {
+                "task_id": task_id,
+                "status": "success",
+                "message": "清空重置成功"
+            }
+        if force_clear:
+            # 强制清空模式：即使无法重新创建也清空文件
+            return {
+                "task_id": task_id,
+                "status": "partial",
+                "message": "文件已清空，但无法重新创建"
+            }
+        return {
+            "task_id": task_id,
+            "status": "failed",
+            "message": "清空重置失败"
+        }
+        
+    except Exception as e:
+        return {
+            "task_id": task_id,
+            "status": "error",
+            "message": f"处理出错: {str(e)}"
+        }
+
+
 @router.post("/batch_clear_reset_tasks")
 def batch_clear_reset_tasks(request: BatchClearResetRequest):
     """批量清空重置任务"""
@@ -1804,52 +1926,32 @@ def batch_clear_reset_tasks(request: BatchClearResetRequest):
         task_ids = request.task_ids
         force_clear = request.force_clear
         
-        logger.info(f"🧹 批量清空重置任务: {len(task_ids)} 个任务")
+        logger.info("🧹 批量清空重置任务: %s 个任务", len(task_ids))
         
-        results = []
-        success_count = 0
+        # 一次加锁，统一从队列中移除所有任务
+        with task_queue._lock:
+            for task_id in task_ids:
+                task_queue.tasks.pop(task_id, None)
         
-        for task_id in task_ids:
-            try:
-                # 从队列中移除任务
-                with task_queue._lock:
-                    if task_id in task_queue.tasks:
-                        del task_queue.tasks[task_id]
-                
-                # 执行清空重置
-                success = clear_and_reset_task(task_id)
-                
-                if success:
-                    results.append({
-                        "task_id": task_id,
-                        "status": "success",
-                        "message": "清空重置成功"
-                    })
-                    success_count += 1
-                else:
-                    if force_clear:
-                        # 强制清空模式：即使无法重新创建也清空文件
-                        results.append({
-                            "task_id": task_id,
-                            "status": "partial",
-                            "message": "文件已清空，但无法重新创建"
-                        })
+        # 各任务的文件清理和重建互不依赖，属于I/O密集操作，并发执行；
+        # 使用独立线程池，避免与 clear_and_reset_task 内部使用的删除线程池互相等待
+        # 结果按请求顺序预先占位，任务完成后按下标回填，完成顺序不影响返回顺序
+        results = [None] * len(task_ids)
+        success_count = 0
+        if task_ids:
+            max_workers = min(32, (os.cpu_count() or 1) * 4, len(task_ids))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="BatchClearReset") as executor:
+                future_to_index = {
+                    executor.submit(_clear_reset_one, task_id, force_clear): index
+                    for index, task_id in enumerate(task_ids)
+                }
+                for future in as_completed(future_to_index):
+                    result = future.result()
+                    results[future_to_index[future]] = result
+                    if result["status"] in ("success", "partial"):
                         success_count += 1
-                    else:
-                        results.append({
-                            "task_id": task_id,
-                            "status": "failed",
-                            "message": "清空重置失败"
-                        })
-                
-            except Exception as e:
-                results.append({
-                    "task_id": task_id,
-                    "status": "error",
-                    "message": f"处理出错: {str(e)}"
-                })
         
-        logger.info(f"✅ 批量清空重置完成: 成功={success_count}, 总数={len(task_ids)}")
+        logger.info("✅ 批量清空重置完成: 成功=%s, 总数=%s", success_count, len(task_ids))
         
         return R.success({
             "results": results,
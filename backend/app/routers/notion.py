@@ -1,6 +1,14 @@
+import asyncio
+import functools
+import hashlib
 import json
 import os  
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+import orjson
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Tuple
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from app.services.notion_service import NotionService
@@ -12,6 +20,176 @@ logger = get_logger(__name__)
 router = APIRouter()
 
 NOTE_OUTPUT_DIR = "note_results"
+# 结果文件路径前缀，拼接路径时直接字符串相加，省去 os.path.join 的参数处理
+_NOTE_OUTPUT_PREFIX = NOTE_OUTPUT_DIR.rstrip("/\\") + os.sep
+
+# 按令牌哈希缓存 NotionService，复用其中的 HTTP 连接池，避免每次请求重新握手
+_NOTION_SERVICE_CACHE_SIZE = 128
+_notion_services: "OrderedDict[bytes, NotionService]" = OrderedDict()
+_notion_services_lock = threading.Lock()
+
+
+def _token_key(token: str) -> bytes:
+    """令牌的哈希摘要，用作各类按令牌缓存的键，避免直接持有原始令牌作为键"""
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def _get_notion_service(token: str) -> NotionService:
+    """获取（必要时创建）与令牌对应的 NotionService 实例"""
+    key = _token_key(token)
+    with _notion_services_lock:
+        service = _notion_services.get(key)
+        if service is not None:
+            _notion_services.move_to_end(key)
+            return service
+    
+    # 创建客户端不持锁，初始化失败时异常直接抛给调用方
+    service = NotionService(token)
+    with _notion_services_lock:
+        service = _notion_services.setdefault(key, service)
+        _notion_services.move_to_end(key)
+        while len(_notion_services) > _NOTION_SERVICE_CACHE_SIZE:
+            _notion_services.popitem(last=False)
+    return service
+
+
+# 数据库列表短期缓存：Notion 搜索接口限速且列表很少变化，缓存期内直接返回
+_DATABASE_LIST_TTL_SECONDS = 30
+_database_list_cache: Dict[bytes, Tuple[float, list]] = {}
+_database_list_lock = threading.Lock()
+
+
+def _list_databases_cached(token: str) -> list:
+    """获取令牌可访问的数据库列表，缓存期内不再请求Notion"""
+    key = _token_key(token)
+    now = time.monotonic()
+    with _database_list_lock:
+        cached = _database_list_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+    
+    databases = _get_notion_service(token).list_databases()
+    with _database_list_lock:
+        # 顺带清理过期条目，避免缓存随令牌数量无限增长
+        for stale_key in [k for k, v in _database_list_cache.items() if v[0] <= now]:
+            del _database_list_cache[stale_key]
+        _database_list_cache[key] = (now + _DATABASE_LIST_TTL_SECONDS, databases)
+    return databases
+
+
+@dataclass(slots=True)
+class _AudioMetaView:
+    """导出到Notion时使用的音频元数据视图"""
+    title: str = '未命名笔记'
+    duration: Optional[float] = None
+    platform: str = ''
+    video_id: str = ''
+    url: str = ''
+    cover_url: str = ''
+    file_path: str = ''
+    raw_info: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _TranscriptView:
+    """导出到Notion时使用的转录结果视图（简化版）"""
+    language: str = ''
+    full_text: str = ''
+    segments: list = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _NoteResultView:
+    """导出到Notion时使用的笔记结果视图，字段与 NoteResult 一致"""
+    markdown: str
+    transcript: _TranscriptView
+    audio_meta: _AudioMetaView
+
+
+def _build_note_result_view(note_data: dict) -> _NoteResultView:
+    """从结果文件内容重建NoteResult结构，供NotionService导出使用"""
+    audio_meta_data = note_data.get('audio_meta', {})
+    audio_meta = _AudioMetaView(
+        title=audio_meta_data.get('title', '未命名笔记'),
+        duration=audio_meta_data.get('duration'),
+        platform=audio_meta_data.get('platform', ''),
+        video_id=audio_meta_data.get('video_id', ''),
+        url=audio_meta_data.get('url', ''),
+        cover_url=audio_meta_data.get('cover_url', ''),
+        file_path=audio_meta_data.get('file_path', ''),
+        raw_info=audio_meta_data.get('raw_info', {}),
+    )
+    
+    transcript_data = note_data.get('transcript', {})
+    transcript = _TranscriptView(
+        language=transcript_data.get('language', ''),
+        full_text=transcript_data.get('full_text', ''),
+        segments=transcript_data.get('segments', []),
+    )
+    
+    return _NoteResultView(
+        markdown=note_data.get('markdown', ''),
+        transcript=transcript,
+        audio_meta=audio_meta,
+    )
+
+
+def _load_note_data(path: str, size: Optional[int] = None) -> dict:
+    """以二进制读取并用 orjson 解析笔记结果文件，orjson 无法解析时回退到标准库
+
+    已知文件大小时预分配缓冲区并一次 readinto 读入，省去按块增长的拷贝。
+    """
+    if size is None:
+        with open(path, "rb") as f:
+            raw = f.read()
+    else:
+        raw = bytearray(size)
+        with open(path, "rb", buffering=0) as f:
+            n = f.readinto(raw)
+        # 读取期间文件被截断时只保留实际读到的部分
+        del raw[n:]
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return json.loads(raw)
+
+
+# 导出到Notion时保留的音频元数据字段（raw_info 是下载器返回的完整原始信息，体积大且导出不使用）
+_NOTION_AUDIO_META_FIELDS = ("title", "duration", "platform", "video_id", "url", "cover_url", "file_path")
+
+
+def _slim_note_data(note_data: dict) -> dict:
+    """只保留导出到Notion所需的字段，丢弃体积最大的 transcript.segments 和 audio_meta.raw_info
+
+    非字典内容原样返回，由 _load_and_sync 按格式错误处理
+    """
+    if not isinstance(note_data, dict):
+        return note_data
+    slim = {key: note_data[key] for key in ("error", "markdown") if key in note_data}
+    audio_meta_data = note_data.get('audio_meta')
+    if isinstance(audio_meta_data, dict):
+        slim['audio_meta'] = {
+            key: audio_meta_data[key] for key in _NOTION_AUDIO_META_FIELDS if key in audio_meta_data
+        }
+    transcript_data = note_data.get('transcript')
+    if isinstance(transcript_data, dict):
+        slim['transcript'] = {
+            'language': transcript_data.get('language', ''),
+            'full_text': transcript_data.get('full_text', ''),
+        }
+    return slim
+
+
+@functools.lru_cache(maxsize=64)
+def _load_note_data_by_version(path: str, mtime_ns: int, size: int) -> dict:
+    """按 (路径, mtime, 大小) 缓存笔记结果，重复同步同一任务时跳过解析；只缓存精简后的字段"""
+    return _slim_note_data(_load_note_data(path, size))
+
+
+def _load_note_data_cached(path: str) -> dict:
+    """读取笔记结果文件（带缓存），返回的数据被多次调用共享，调用方不得修改"""
+    st = os.stat(path)
+    return _load_note_data_by_version(path, st.st_mtime_ns, st.st_size)
 
 class NotionTokenRequest(BaseModel):
     """Notion令牌请求模型"""
@@ -37,7 +215,7 @@ class BatchSyncToNotionRequest(BaseModel):
 def test_notion_connection(request: NotionTokenRequest):
     """测试Notion连接"""
     try:
-        notion_service = NotionService(request.token)
+        notion_service = _get_notion_service(request.token)
         is_connected = notion_service.test_connection()
         
         if is_connected:
@@ -54,11 +232,9 @@ def test_notion_connection(request: NotionTokenRequest):
 
 @router.post("/list_databases")
 def list_notion_databases(request: NotionTokenRequest):
-    """获取Notion数据库列表"""
+    """获取Notion数据库列表（服务端短期缓存）"""
     try:
-        notion_service = NotionService(request.token)
-        databases = notion_service.list_databases()
-        
+        databases = _list_databases_cached(request.token)
         return R.success({
             "databases": databases,
             "count": len(databases)
@@ -68,225 +244,175 @@ def list_notion_databases(request: NotionTokenRequest):
         logger.error(f"获取数据库列表失败: {e}")
         return R.error(f"获取数据库列表失败: {str(e)}")
 
+def _load_and_sync(notion_service: NotionService, task_id: str, result_path: str, target,
+                   load_note=_load_note_data_cached) -> dict:
+    """读取单个笔记结果并创建Notion页面，返回该任务的同步结果；save_note 与 batch_sync 共用
+
+    target 为携带 database_id / data_source_id / parent_page_id 的请求对象；
+    读取结果文件时的异常（如文件不存在）直接抛给调用方处理。
+    """
+    note_data = load_note(result_path)
+    
+    if not isinstance(note_data, dict):
+        logger.error(f"笔记数据格式错误 {task_id}: 结果文件内容不是对象 ({type(note_data).__name__})")
+        return {
+            "task_id": task_id,
+            "success": False,
+            "error": f"笔记数据格式错误: 结果文件内容不是对象 ({type(note_data).__name__})"
+        }
+    
+    # 检查是否有错误
+    if "error" in note_data:
+        return {
+            "task_id": task_id,
+            "success": False,
+            "error": f"笔记生成失败: {note_data['error']}"
+        }
+    
+    # 重构NoteResult对象（由于从JSON加载，需要重新构建对象结构）
+    try:
+        note_result = _build_note_result_view(note_data)
+    except Exception as e:
+        logger.error(f"重构笔记数据失败 {task_id}: {e}")
+        return {
+            "task_id": task_id,
+            "success": False,
+            "error": f"笔记数据格式错误: {str(e)}"
+        }
+    
+    # 根据是否提供database_id来决定创建方式
+    if target.database_id:
+        # 在数据库中创建页面（支持data_source_id参数）
+        result = notion_service.create_page_in_database(
+            target.database_id, 
+            note_result,
+            data_source_id=target.data_source_id
+        )
+    else:
+        # 创建独立页面
+        result = notion_service.create_standalone_page(note_result, target.parent_page_id)
+    
+    if result["success"]:
+        logger.info(f"✅ 成功同步笔记到Notion: {task_id} -> {result['page_id']}")
+        return {
+            "task_id": task_id,
+            "success": True,
+            "page_id": result["page_id"],
+            "page_url": result["url"],
+            "title": result["title"]
+        }
+    
+    logger.error(f"❌ 同步笔记到Notion失败: {task_id} -> {result['error']}")
+    return {
+        "task_id": task_id,
+        "success": False,
+        "error": result["error"]
+    }
+
+
 @router.post("/save_note")
 def save_note_to_notion(request: SaveToNotionRequest):
     """保存笔记到Notion"""
     try:
-        # 检查任务结果文件是否存在
-        result_path = os.path.join(NOTE_OUTPUT_DIR, f"{request.task_id}.json")
-        if not os.path.exists(result_path):
-            return R.error("笔记文件未找到，请确保任务已完成")
-        
-        # 读取笔记数据
-        with open(result_path, "r", encoding="utf-8") as f:
-            note_data = json.load(f)
-        
-        # 检查是否有错误
-        if "error" in note_data:
-            return R.error(f"笔记生成失败: {note_data['error']}")
-        
-        # 重构NoteResult对象
-        # 由于从JSON加载，需要重新构建对象结构
-        try:
-            # 创建一个简化的note_result对象用于Notion导出
-            from app.models.audio_model import AudioDownloadResult
-            from app.models.transcriber_model import TranscriptResult, TranscriptSegment
-            
-            # 重建AudioDownloadResult
-            audio_meta_data = note_data.get('audio_meta', {})
-            audio_meta = type('AudioMeta', (), {
-                'title': audio_meta_data.get('title', '未命名笔记'),
-                'duration': audio_meta_data.get('duration'),
-                'platform': audio_meta_data.get('platform', ''),
-                'video_id': audio_meta_data.get('video_id', ''),
-                'url': audio_meta_data.get('url', ''),
-                'cover_url': audio_meta_data.get('cover_url', ''),
-                'file_path': audio_meta_data.get('file_path', ''),
-                'raw_info': audio_meta_data.get('raw_info', {})
-            })()
-            
-            # 重建TranscriptResult（简化版）
-            transcript_data = note_data.get('transcript', {})
-            transcript = type('Transcript', (), {
-                'language': transcript_data.get('language', ''),
-                'full_text': transcript_data.get('full_text', ''),
-                'segments': transcript_data.get('segments', [])
-            })()
-            
-            # 创建NoteResult对象
-            note_result = type('NoteResult', (), {
-                'markdown': note_data.get('markdown', ''),
-                'transcript': transcript,
-                'audio_meta': audio_meta
-            })()
-            
-        except Exception as e:
-            logger.error(f"重构笔记数据失败: {e}")
-            return R.error(f"笔记数据格式错误: {str(e)}")
-        
         # 初始化Notion服务
-        notion_service = NotionService(request.token)
+        notion_service = _get_notion_service(request.token)
         
-        # 根据是否提供database_id来决定创建方式
-        if request.database_id:
-            # 在数据库中创建页面（支持data_source_id参数）
-            result = notion_service.create_page_in_database(
-                request.database_id, 
-                note_result, 
-                data_source_id=request.data_source_id
-            )
-        else:
-            # 创建独立页面
-            result = notion_service.create_standalone_page(note_result, request.parent_page_id)
+        # 直接 stat + 读取，文件不存在时由 FileNotFoundError 判定，省去单独的 exists 检查
+        result_path = _NOTE_OUTPUT_PREFIX + request.task_id + ".json"
+        try:
+            entry = _load_and_sync(notion_service, request.task_id, result_path, request)
+        except FileNotFoundError:
+            return R.error("笔记文件未找到，请确保任务已完成")
         
-        if result["success"]:
-            logger.info(f"成功保存笔记到Notion: {result['page_id']}")
+        if entry["success"]:
             return R.success({
-                "page_id": result["page_id"],
-                "url": result["url"],
-                "title": result["title"],
+                "page_id": entry["page_id"],
+                "url": entry["page_url"],
+                "title": entry["title"],
                 "message": "笔记已成功保存到Notion"
             })
         else:
-            return R.error(f"保存到Notion失败: {result['error']}")
+            return R.error(f"保存到Notion失败: {entry['error']}")
             
     except Exception as e:
         logger.error(f"保存到Notion失败: {e}")
         return R.error(f"保存失败: {str(e)}")
 
+# 批量同步时同时进行的Notion页面创建数（Notion API 限速约为平均每秒3个请求）
+_NOTION_BATCH_CONCURRENCY = 3
+
+
+def _load_note_data_slim(path: str) -> dict:
+    """读取笔记结果文件（不缓存，批量同步逐个读取一次即可）并只保留导出所需字段"""
+    return _slim_note_data(_load_note_data(path))
+
+
+def _sync_note_file(notion_service: NotionService, request: BatchSyncToNotionRequest,
+                    task_id: str, result_path: str) -> dict:
+    """批量同步中处理单个笔记文件（在线程池中执行），任何异常都转换为失败结果"""
+    try:
+        return _load_and_sync(notion_service, task_id, result_path, request, load_note=_load_note_data_slim)
+    except Exception as e:
+        logger.error(f"处理笔记文件失败 {task_id}: {e}")
+        return {
+            "task_id": task_id,
+            "success": False,
+            "error": f"处理文件失败: {str(e)}"
+        }
+
+
 @router.post("/batch_sync")
-def batch_sync_to_notion(request: BatchSyncToNotionRequest):
+async def batch_sync_to_notion(request: BatchSyncToNotionRequest):
     """批量同步笔记到Notion"""
     try:
-        # 获取所有可用的笔记文件
-        if not os.path.exists(NOTE_OUTPUT_DIR):
+        # 获取所有可用的笔记文件（单次目录遍历，文件名 -> 路径）
+        try:
+            with os.scandir(NOTE_OUTPUT_DIR) as entries:
+                all_note_files = {
+                    entry.name: entry.path
+                    for entry in entries
+                    if entry.name.endswith('.json') and entry.is_file()
+                }
+        except FileNotFoundError:
             return R.error("笔记目录不存在")
         
-        all_note_files = [f for f in os.listdir(NOTE_OUTPUT_DIR) if f.endswith('.json')]
-        
         if not all_note_files:
             return R.error("未找到任何笔记文件")
         
-        # 如果指定了task_ids，则只处理这些任务
+        # 如果指定了task_ids，则只处理这些任务（字典查找，不再逐个扫描文件列表）
         if request.task_ids:
             target_files = [f"{task_id}.json" for task_id in request.task_ids if f"{task_id}.json" in all_note_files]
         else:
-            target_files = all_note_files
+            target_files = list(all_note_files)
         
         if not target_files:
             return R.error("未找到符合条件的笔记文件")
         
         # 初始化Notion服务
         try:
-            notion_service = NotionService(request.token)
+            notion_service = _get_notion_service(request.token)
         except Exception as e:
             return R.error(f"Notion服务初始化失败: {str(e)}")
         
-        # 批量同步结果
-        sync_results = []
-        success_count = 0
-        failed_count = 0
-        
         logger.info(f"开始批量同步 {len(target_files)} 个笔记到Notion")
         
-        for file_name in target_files:
-            task_id = file_name.replace('.json', '')
-            result_path = os.path.join(NOTE_OUTPUT_DIR, file_name)
-            
-            try:
-                # 读取笔记数据
-                with open(result_path, "r", encoding="utf-8") as f:
-                    note_data = json.load(f)
-                
-                # 检查是否有错误
-                if "error" in note_data:
-                    sync_results.append({
-                        "task_id": task_id,
-                        "success": False,
-                        "error": f"笔记生成失败: {note_data['error']}"
-                    })
-                    failed_count += 1
-                    continue
-                
-                # 重构NoteResult对象
-                try:
-                    # 创建音频元数据对象
-                    audio_meta_data = note_data.get('audio_meta', {})
-                    audio_meta = type('AudioMeta', (), {
-                        'title': audio_meta_data.get('title', '未命名笔记'),
-                        'duration': audio_meta_data.get('duration'),
-                        'platform': audio_meta_data.get('platform', ''),
-                        'video_id': audio_meta_data.get('video_id', ''),
-                        'url': audio_meta_data.get('url', ''),
-                        'cover_url': audio_meta_data.get('cover_url', ''),
-                        'file_path': audio_meta_data.get('file_path', ''),
-                        'raw_info': audio_meta_data.get('raw_info', {})
-                    })()
-                    
-                    # 创建转录对象
-                    transcript_data = note_data.get('transcript', {})
-                    transcript = type('Transcript', (), {
-                        'language': transcript_data.get('language', ''),
-                        'full_text': transcript_data.get('full_text', ''),
-                        'segments': transcript_data.get('segments', [])
-                    })()
-                    
-                    # 创建NoteResult对象
-                    note_result = type('NoteResult', (), {
-                        'markdown': note_data.get('markdown', ''),
-                        'transcript': transcript,
-                        'audio_meta': audio_meta
-                    })()
-                    
-                except Exception as e:
-                    logger.error(f"重构笔记数据失败 {task_id}: {e}")
-                    sync_results.append({
-                        "task_id": task_id,
-                        "success": False,
-                        "error": f"笔记数据格式错误: {str(e)}"
-                    })
-                    failed_count += 1
-                    continue
-                
-                # 同步到Notion
-                if request.database_id:
-                    # 在数据库中创建页面（支持data_source_id参数）
-                    result = notion_service.create_page_in_database(
-                        request.database_id, 
-                        note_result,
-                        data_source_id=request.data_source_id
-                    )
-                else:
-                    # 创建独立页面
-                    result = notion_service.create_standalone_page(note_result, request.parent_page_id)
-                
-                if result["success"]:
-                    sync_results.append({
-                        "task_id": task_id,
-                        "success": True,
-                        "page_id": result["page_id"],
-                        "page_url": result["url"],
-                        "title": result["title"]
-                    })
-                    success_count += 1
-                    logger.info(f"✅ 成功同步笔记到Notion: {task_id} -> {result['page_id']}")
-                else:
-                    sync_results.append({
-                        "task_id": task_id,
-                        "success": False,
-                        "error": result["error"]
-                    })
-                    failed_count += 1
-                    logger.error(f"❌ 同步笔记到Notion失败: {task_id} -> {result['error']}")
-                    
-            except Exception as e:
-                logger.error(f"处理笔记文件失败 {task_id}: {e}")
-                sync_results.append({
-                    "task_id": task_id,
-                    "success": False,
-                    "error": f"处理文件失败: {str(e)}"
-                })
-                failed_count += 1
+        # 各笔记的读取和页面创建互不依赖，放到线程池中并发执行，用信号量限制同时请求Notion的数量
+        semaphore = asyncio.Semaphore(_NOTION_BATCH_CONCURRENCY)
+        
+        async def sync_one(file_name: str) -> dict:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    _sync_note_file,
+                    notion_service,
+                    request,
+                    file_name.replace('.json', ''),
+                    all_note_files[file_name],
+                )
+        
+        # 批量同步结果（与 target_files 顺序一致）
+        sync_results = await asyncio.gather(*(sync_one(file_name) for file_name in target_files))
+        success_count = sum(1 for r in sync_results if r["success"])
+        failed_count = len(sync_results) - success_count
         
         # 返回批量同步结果
         logger.info(f"批量同步完成: 成功 {success_count} 个，失败 {failed_count} 个")
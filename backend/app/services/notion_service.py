@@ -1,7 +1,10 @@
 import os
 import re
+import httpx
 import requests
 import mimetypes
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, Dict, Any, List
 from notion_client import Client
 from datetime import datetime
@@ -24,7 +27,29 @@ class NotionService:
         try:
             self.token = token  # 保存token用于直接API调用
             # 使用最新的Notion API版本 2025-09-03（支持多数据源）
-            self.client = Client(auth=token, notion_version="2025-09-03")
+            # 服务实例按令牌缓存复用，显式延长空闲连接保活时间，连续请求之间不必重新握手
+            self.client = Client(
+                auth=token,
+                notion_version="2025-09-03",
+                client=httpx.Client(limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30.0)),
+            )
+            # 直接调用的 HTTP 请求（旧版API回退、文件上传）共用一个会话，复用连接
+            self.session = requests.Session()
+            # 放大连接池并对 GET 的限流/网关错误自动退避重试（POST 不重试，避免重复创建上传对象）
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=32,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    # 重试耗尽后返回最后一次响应，由调用方按状态码处理
+                    raise_on_status=False,
+                    allowed_methods=["GET"],
+                ),
+            )
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
             logger.info("Notion客户端初始化成功 (API版本: 2025-09-03)")
         except Exception as e:
             logger.error(f"Notion客户端初始化失败: {e}")
@@ -207,13 +232,12 @@ class NotionService:
                 # Notion API 2025-09-03 回退方案：使用旧版API获取properties
                 logger.info("🔄 使用旧版API (2022-06-28) 获取数据库属性...")
                 try:
-                    import requests
                     headers = {
                         "Authorization": f"Bearer {self.token}",
                         "Notion-Version": "2022-06-28",
                         "Content-Type": "application/json"
                     }
-                    http_response = requests.get(
+                    http_response = self.session.get(
                         f"https://api.notion.com/v1/databases/{database_id}",
                         headers=headers,
                         timeout=30
@@ -290,13 +314,12 @@ class NotionService:
                 # Notion API 2025-09-03 的解决方案：直接使用原始 HTTP 请求获取完整的数据库信息
                 logger.info("🔄 尝试使用原始HTTP请求获取数据库schema...")
                 try:
-                    import requests
                     headers = {
                         "Authorization": f"Bearer {self.token}",
                         "Notion-Version": "2022-06-28",  # 使用旧版API来获取properties
                         "Content-Type": "application/json"
                     }
-                    response = requests.get(
+                    response = self.session.get(
                         f"https://api.notion.com/v1/databases/{database_id}",
                         headers=headers,
                         timeout=30
@@ -692,12 +715,12 @@ class NotionService:
                 if file_path.startswith(('http://', 'https://')):
                     # 网络文件
                     logger.info(f"正在下载网络文件: {file_path}")
-                    file_response = requests.get(file_path, timeout=30)
+                    file_response = self.session.get(file_path, timeout=30)
                     if file_response.status_code == 200:
                         file_content = file_response.content
                         content_type = file_response.headers.get('content-type', 'application/octet-stream')
                         if not final_filename:
-                            final_filename = file_path.split('/')[-1]
+                            final_filename = file_path.rpartition('/')[2]
                     else:
                         logger.error(f"下载网络文件失败: {file_path}, 状态码: {file_response.status_code}")
                         return None
@@ -772,7 +795,7 @@ class NotionService:
             
             logger.info(f"创建File Upload对象: filename={final_filename}, content_type={content_type}, size={len(file_content)} bytes")
             
-            file_upload_response = requests.post(
+            file_upload_response = self.session.post(
                 "https://api.notion.com/v1/file_uploads",
                 headers={
                     "Authorization": f"Bearer {self.token}",
@@ -800,7 +823,7 @@ class NotionService:
             
             logger.info(f"开始上传文件内容到: {upload_url}")
             
-            upload_response = requests.post(
+            upload_response = self.session.post(
                 upload_url,
                 headers={
                     "Authorization": f"Bearer {self.token}",
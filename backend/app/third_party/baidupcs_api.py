@@ -6,7 +6,9 @@ BaiduPCS API 下载器
 """
 
 import os
+import re
 import hashlib
+import threading
 import time
 from typing import Optional, Dict, Any
 from pathlib import Path
@@ -19,6 +21,20 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# 文件名空白规范化用的正则，模块级预编译，逐个文件比对时直接复用
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 媒体文件扩展名，模块级不可变集合，列目录时不再每次重建
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.3gp', '.ts', '.m2ts', '.f4v', '.rmvb', '.rm'})
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a', '.ape', '.ac3', '.dts'})
+MEDIA_EXTENSIONS = VIDEO_EXTENSIONS | AUDIO_EXTENSIONS
+
+# 文件大小单位，按 1024 的幂次排列
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# 用户信息缓存时间（秒）：每个接口都会先做认证检查，避免每次都请求百度网盘
+_USER_INFO_TTL_SECONDS = 300
+
 
 class BaiduPCSDownloader:
     """BaiduPCS API 下载器 - 直接使用 Python API，完全替代命令行工具"""
@@ -47,6 +63,29 @@ class BaiduPCSDownloader:
                 api = None
 
         self.api = api
+        
+        # 用户信息缓存（认证检查和用户信息接口共用）
+        self._user_info_cache = None
+        self._user_info_cached_at = 0.0
+    
+    def _get_user_info_cached(self):
+        """
+        获取用户信息，成功结果缓存 _USER_INFO_TTL_SECONDS 秒
+        
+        失败（抛异常或返回 None）不缓存，下次调用会重新请求
+        """
+        if self.api is None:
+            return None
+        
+        now = time.monotonic()
+        if self._user_info_cache is not None and now - self._user_info_cached_at < _USER_INFO_TTL_SECONDS:
+            return self._user_info_cache
+        
+        user_info = self.api.user_info()
+        if user_info is not None:
+            self._user_info_cache = user_info
+            self._user_info_cached_at = now
+        return user_info
     
     def file_exists(self, remote_path: str) -> bool:
         """
@@ -91,35 +130,33 @@ class BaiduPCSDownloader:
             文件信息字典，如果文件不存在则返回 None
         """
         try:
-            import re
-            
             parent_dir = os.path.dirname(remote_path)
             filename = os.path.basename(remote_path)
             
-            logger.info(f"🔍 获取文件信息:")
-            logger.info(f"   父目录: {parent_dir}")
-            logger.info(f"   文件名: {filename}")
+            logger.info("🔍 获取文件信息:")
+            logger.info("   父目录: %s", parent_dir)
+            logger.info("   文件名: %s", filename)
             
             # 列出父目录
-            logger.info(f"📋 列出父目录内容...")
+            logger.info("📋 列出父目录内容...")
             pcs_files = self.api.list(parent_dir)
-            logger.info(f"✅ 找到 {len(pcs_files)} 个文件/目录")
+            logger.info("✅ 找到 %s 个文件/目录", len(pcs_files))
             
             # 规范化文件名中的空格
             # 策略1: 将多个空格替换为单个空格
-            normalized_filename = re.sub(r'\s+', ' ', filename)
+            normalized_filename = _WHITESPACE_RE.sub(' ', filename)
             # 策略2: 移除所有空格（用于更宽松的匹配）
-            no_space_filename = re.sub(r'\s+', '', filename)
+            no_space_filename = _WHITESPACE_RE.sub('', filename)
             
             # 查找文件
             for pcs_file in pcs_files:
                 actual_filename = os.path.basename(pcs_file.path)
-                normalized_actual = re.sub(r'\s+', ' ', actual_filename)
-                no_space_actual = re.sub(r'\s+', '', actual_filename)
+                normalized_actual = _WHITESPACE_RE.sub(' ', actual_filename)
+                no_space_actual = _WHITESPACE_RE.sub('', actual_filename)
                 
                 # 先尝试精确匹配
                 if pcs_file.path == remote_path or actual_filename == filename:
-                    logger.info(f"✅ 精确匹配成功: {actual_filename}")
+                    logger.info("✅ 精确匹配成功: %s", actual_filename)
                     return {
                         'path': pcs_file.path,
                         'size': pcs_file.size,
@@ -130,9 +167,9 @@ class BaiduPCSDownloader:
                 
                 # 尝试规范化空格后匹配（多个空格 -> 单个空格）
                 if normalized_actual == normalized_filename:
-                    logger.info(f"🔍 通过规范化空格找到匹配文件 (多空格->单空格):")
-                    logger.info(f"   请求的文件名: {repr(filename)}")
-                    logger.info(f"   实际的文件名: {repr(actual_filename)}")
+                    logger.info("🔍 通过规范化空格找到匹配文件 (多空格->单空格):")
+                    logger.info("   请求的文件名: %r", filename)
+                    logger.info("   实际的文件名: %r", actual_filename)
                     return {
                         'path': pcs_file.path,
                         'size': pcs_file.size,
@@ -143,9 +180,9 @@ class BaiduPCSDownloader:
                 
                 # 尝试移除所有空格后匹配（更宽松的匹配）
                 if no_space_actual == no_space_filename:
-                    logger.info(f"🔍 通过移除空格找到匹配文件 (忽略所有空格):")
-                    logger.info(f"   请求的文件名: {repr(filename)}")
-                    logger.info(f"   实际的文件名: {repr(actual_filename)}")
+                    logger.info("🔍 通过移除空格找到匹配文件 (忽略所有空格):")
+                    logger.info("   请求的文件名: %r", filename)
+                    logger.info("   实际的文件名: %r", actual_filename)
                     return {
                         'path': pcs_file.path,
                         'size': pcs_file.size,
@@ -155,9 +192,9 @@ class BaiduPCSDownloader:
                     }
             
             logger.warning(f"⚠️ 未找到匹配文件: {filename}")
-            logger.info(f"📁 目录中的前10个文件:")
+            logger.info("📁 目录中的前10个文件:")
             for i, pcs_file in enumerate(pcs_files[:10]):
-                logger.info(f"   [{i+1}] {os.path.basename(pcs_file.path)}")
+                logger.info("   [%s] %s", i+1, os.path.basename(pcs_file.path))
             
             return None
         except Exception as e:
@@ -290,7 +327,7 @@ class BaiduPCSDownloader:
                     elapsed = current_time - start_time
                     speed = downloaded / elapsed / 1024 / 1024  # MB/s
                     progress = (downloaded / total_size * 100) if total_size > 0 else 0
-                    logger.info(f"📥 下载进度: {progress:.1f}% ({downloaded/1024/1024:.1f}MB/{total_size/1024/1024:.1f}MB) 速度: {speed:.2f}MB/s")
+                    logger.info("📥 下载进度: %.1f%% (%.1fMB/%.1fMB) 速度: %.2fMB/s", progress, downloaded/1024/1024, total_size/1024/1024, speed)
                     last_log_time[0] = current_time
             
             # 🔧 传递 max_chunk_size 参数以提高下载速度
@@ -317,9 +354,13 @@ class BaiduPCSDownloader:
             # 等待文件完全写入
             time.sleep(0.5)
             
-            # 验证下载结果
-            if os.path.exists(local_path):
-                actual_size = os.path.getsize(local_path)
+            # 验证下载结果（一次 stat 同时完成存在性检查和大小读取）
+            try:
+                actual_size = os.stat(local_path).st_size
+            except FileNotFoundError:
+                actual_size = None
+            
+            if actual_size is not None:
                 total_time = time.time() - start_time
                 avg_speed = actual_size / total_time / 1024 / 1024  # MB/s
                 
@@ -365,8 +406,8 @@ class BaiduPCSDownloader:
             if self.api is None:
                 return False
             
-            # 尝试获取用户信息来验证认证状态
-            user_info = self.api.user_info()
+            # 尝试获取用户信息来验证认证状态（短时间内复用缓存结果）
+            user_info = self._get_user_info_cached()
             return user_info is not None
         except Exception as e:
             logger.error(f"检查认证状态失败: {e}")
@@ -392,31 +433,30 @@ class BaiduPCSDownloader:
             logger.info(f"📋 Cookies前200字符: {cookies[:200]}")
             logger.info(f"📋 Cookies后200字符: {cookies[-200:]}")
             
-            # 解析 cookies 获取 BDUSS 和 STOKEN
+            # 解析 cookies 获取 BDUSS 和 STOKEN：单次遍历，同时收集键名用于调试
             bduss = None
             stoken = None
-            
-            # 调试：显示所有cookie键
             cookie_keys = []
+            
             for cookie in cookies.split(';'):
-                cookie = cookie.strip()
-                if '=' in cookie:
-                    key = cookie.split('=')[0]
-                    cookie_keys.append(key)
+                key, sep, value = cookie.partition('=')
+                if not sep:
+                    continue
+                key = key.strip()
+                cookie_keys.append(key)
+                if key == 'BDUSS':
+                    bduss = value.strip()
+                elif key == 'STOKEN':
+                    stoken = value.strip()
             
             logger.info(f"📋 发现的Cookie键: {', '.join(cookie_keys)}")
-            
-            for cookie in cookies.split(';'):
-                cookie = cookie.strip()
-                if cookie.startswith('BDUSS='):
-                    bduss = cookie.split('=', 1)[1].strip()
-                    logger.info(f"✅ 找到BDUSS，长度: {len(bduss)}")
-                elif cookie.startswith('BDUSS_BFESS='):
-                    # 注意：BDUSS_BFESS 不是 BDUSS，跳过
-                    logger.info(f"⚠️  发现BDUSS_BFESS（这不是BDUSS）")
-                elif cookie.startswith('STOKEN='):
-                    stoken = cookie.split('=', 1)[1].strip()
-                    logger.info(f"✅ 找到STOKEN，长度: {len(stoken)}")
+            if bduss:
+                logger.info(f"✅ 找到BDUSS，长度: {len(bduss)}")
+            elif 'BDUSS_BFESS' in cookie_keys:
+                # 注意：BDUSS_BFESS 不是 BDUSS，跳过
+                logger.info(f"⚠️  发现BDUSS_BFESS（这不是BDUSS）")
+            if stoken:
+                logger.info(f"✅ 找到STOKEN，长度: {len(stoken)}")
             
             if not bduss:
                 logger.error("❌ cookies中未找到BDUSS")
@@ -488,8 +528,9 @@ class BaiduPCSDownloader:
             self.account_manager.su(account.user.user_id)
             self.account_manager.save(ACCOUNT_DATA_PATH)
             
-            # 更新当前 API 实例
+            # 更新当前 API 实例，切换账号后用户信息缓存失效
             self.api = account.pcsapi()
+            self._user_info_cache = None
             
             logger.info("✅ 用户添加成功并已保存")
             return {
@@ -523,7 +564,7 @@ class BaiduPCSDownloader:
                 }
             
             # 获取用户信息
-            user_info = self.api.user_info()
+            user_info = self._get_user_info_cached()
             
             if user_info:
                 return {
@@ -578,43 +619,47 @@ class BaiduPCSDownloader:
                 cache = get_baidu_pan_cache()
                 cached_result = cache.get(cache_key)
                 if cached_result is not None:
-                    logger.info(f"✅ 使用缓存的文件列表: {path} (recursive={recursive})")
+                    logger.info("✅ 使用缓存的文件列表: %s (recursive=%s)", path, recursive)
                     return cached_result
             
-            logger.info(f"🔍 从百度网盘API获取文件列表: {path} (recursive={recursive})")
+            logger.info("🔍 从百度网盘API获取文件列表: %s (recursive=%s)", path, recursive)
             start_time = time.time()
             
             # 列出文件
             pcs_files = self.api.list(path)
             
-            # 定义媒体文件扩展名（预编译为集合以提高性能）
-            video_extensions = {'.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.3gp', '.ts', '.m2ts', '.f4v', '.rmvb', '.rm'}
-            audio_extensions = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a', '.ape', '.ac3', '.dts'}
-            media_extensions = video_extensions | audio_extensions
-            
             files = []
+            # 🚀 循环内用到的函数/集合先绑定到局部变量；PcsFile 是 NamedTuple，字段必定存在，无需 hasattr
+            append = files.append
+            format_size = self._format_size
+            splitext = os.path.splitext
+            media_extensions = MEDIA_EXTENSIONS
             for pcs_file in pcs_files:
-                filename = os.path.basename(pcs_file.path)
-                file_ext = os.path.splitext(filename)[1].lower()
-                
-                # 🚀 优化：只判断一次是否为媒体文件
-                is_media = (file_ext in media_extensions) and (not pcs_file.is_dir)
+                path = pcs_file.path
+                is_dir = pcs_file.is_dir
+                size = pcs_file.size
+                # 网盘路径统一使用 / 分隔
+                filename = path.rpartition('/')[2]
                 
-                # 🚀 优化：格式化文件大小
-                size_readable = self._format_size(pcs_file.size) if not pcs_file.is_dir else "-"
+                if is_dir:
+                    is_media = False
+                    size_readable = "-"
+                else:
+                    # 🚀 优化：只判断一次是否为媒体文件
+                    is_media = splitext(filename)[1].lower() in media_extensions
+                    size_readable = format_size(size)
                 
-                file_info = {
-                    'path': pcs_file.path,
+                append({
+                    'path': path,
                     'filename': filename,
-                    'is_dir': pcs_file.is_dir,
+                    'is_dir': is_dir,
                     'is_media': is_media,
-                    'size': pcs_file.size,
+                    'size': size,
                     'size_readable': size_readable,
                     'fs_id': pcs_file.fs_id,
-                    'md5': pcs_file.md5 if hasattr(pcs_file, 'md5') else None,
-                    'ctime': pcs_file.server_ctime if hasattr(pcs_file, 'server_ctime') else pcs_file.server_mtime
-                }
-                files.append(file_info)
+                    'md5': pcs_file.md5,
+                    'ctime': pcs_file.server_ctime,
+                })
                 
                 # 如果是目录且需要递归
                 if recursive and pcs_file.is_dir:
@@ -623,7 +668,7 @@ class BaiduPCSDownloader:
                         files.extend(sub_result.get('files', []))
             
             elapsed_time = time.time() - start_time
-            logger.info(f"✅ 文件列表获取成功: {len(files)} 个项目，耗时: {elapsed_time:.2f}秒")
+            logger.info("✅ 文件列表获取成功: %s 个项目，耗时: %.2f秒", len(files), elapsed_time)
             
             result = {
                 'success': True,
@@ -639,7 +684,7 @@ class BaiduPCSDownloader:
                 # 非递归模式使用较短的TTL（5分钟）
                 ttl = 600 if recursive else 300
                 cache.set(cache_key, result, ttl=ttl)
-                logger.debug(f"💾 文件列表已缓存: {path} (TTL={ttl}秒)")
+                logger.debug("💾 文件列表已缓存: %s (TTL=%s秒)", path, ttl)
             
             return result
             
@@ -662,11 +707,9 @@ class BaiduPCSDownloader:
         Returns:
             格式化后的大小字符串
         """
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size < 1024.0:
-                return f"{size:.2f} {unit}"
-            size /= 1024.0
-        return f"{size:.2f} PB"
+        # 用 bit_length 直接算出单位档位（每档 10 位），免去逐级除法循环
+        index = min((size.bit_length() - 1) // 10, 5) if size >= 1024 else 0
+        return f"{size / (1 << (10 * index)):.2f} {_SIZE_UNITS[index]}"
     
     def upload_file(self, local_path: str, remote_path: str) -> Dict[str, Any]:
         """
@@ -722,6 +765,25 @@ def create_downloader() -> BaiduPCSDownloader:
     return BaiduPCSDownloader()
 
 
+_shared_downloader: Optional[BaiduPCSDownloader] = None
+_shared_downloader_lock = threading.Lock()
+
+
+def get_shared_downloader() -> BaiduPCSDownloader:
+    """
+    获取进程内共享的下载器实例
+    
+    账号数据只从磁盘加载一次，BaiduPCSApi 的 HTTP 会话和用户信息缓存在各调用方之间复用；
+    任意调用方添加/切换用户后，其他调用方立即可见
+    """
+    global _shared_downloader
+    if _shared_downloader is None:
+        with _shared_downloader_lock:
+            if _shared_downloader is None:
+                _shared_downloader = BaiduPCSDownloader()
+    return _shared_downloader
+
+
 if __name__ == "__main__":
     # 测试代码
     import sys